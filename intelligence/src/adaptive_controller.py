@@ -0,0 +1,155 @@
+import csv
+import os
+import time
+
+from perf_metrics import RingBuffer
+
+# --- CONFIGURATION ---
+LOGS_DIR = os.path.join("intelligence", "logs")
+
+# Quality ladder, best first: (detection scale, run detection+inference every Nth displayed frame)
+LEVELS = [
+    (1.0, 1),
+    (0.75, 1),
+    (0.5, 1),
+    (0.5, 2),
+    (0.33, 2),
+    (0.33, 3),
+    (0.25, 4),
+]
+
+
+class AdaptiveController:
+    """
+    Python mirror of performance_plan Task 4 (dynamic resolution + decoupled AI loop).
+
+    The display loop reports every frame; the AI step (detect + classify) only runs
+    on frames where `should_run_ai()` is True, so display keeps full rate while the
+    controller trades detection resolution and inference rate against a frame budget.
+
+    Ladder scales are relative to `base_scale` (the user's --detect-scale), so L0 is
+    exactly what was asked for and every step down is a fraction of it.
+
+    Every `decision_interval` frames:
+      - over budget          -> step down one level immediately
+      - projected next level
+        fits in budget*headroom for `recover_after` decisions in a row -> step up
+    """
+
+    def __init__(self, target_fps=30, window=30, decision_interval=15, headroom=0.8,
+                 recover_after=3, levels=LEVELS, start_level=0, base_scale=1.0, log_path=None):
+        if target_fps <= 0:
+            raise ValueError(f"target_fps must be positive, got {target_fps}")
+        self.budget_ms = 1000.0 / target_fps
+        self.decision_interval = decision_interval
+        self.headroom = headroom
+        self.recover_after = recover_after
+        self.levels = levels
+        self.level = start_level
+        self.base_scale = base_scale
+
+        self.frame_ms = RingBuffer(window)   # Processing time, camera wait removed: what the budget judges
+        self.wall_ms = RingBuffer(window)    # Full frame interval: what the user actually sees
+        self.detect_ms = RingBuffer(window)
+        self.infer_ms = RingBuffer(window)
+        self._frames = 0
+        self._healthy_decisions = 0
+
+        self.log_path = log_path
+        self._log = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            self._log = open(log_path, "w", newline="")
+            self._writer = csv.writer(self._log)
+            self._writer.writerow(["time", "frame", "action", "level", "detect_scale", "ai_every",
+                                   "frame_ms", "capacity_fps", "fps", "detect_ms", "infer_ms", "projected_ms"])
+
+    # --- CURRENT SETTINGS ---
+    @property
+    def detect_scale(self):
+        return self.levels[self.level][0] * self.base_scale
+
+    @property
+    def ai_every(self):
+        return self.levels[self.level][1]
+
+    def should_run_ai(self):
+        return self._frames % self.ai_every == 0
+
+    # --- FEEDBACK ---
+    def on_frame(self, frame_ms, detect_ms=None, infer_ms=None, capture_ms=0.0):
+        """
+        Call once per displayed frame; pass stage latencies only on frames where the AI ran.
+        `capture_ms` (time blocked in the camera read) is taken out of `frame_ms`: a loop
+        paced by a 30 fps camera is idle, not over budget.
+        """
+        self.frame_ms.push(max(frame_ms - capture_ms, 0.0))
+        self.wall_ms.push(frame_ms)
+        if detect_ms is not None:
+            # Normalise to full resolution so samples from different levels are comparable
+            self.detect_ms.push(detect_ms / max(self.detect_scale ** 2, 1e-6))
+        if infer_ms is not None:
+            self.infer_ms.push(infer_ms)
+
+        self._frames += 1
+        if self._frames % self.decision_interval == 0 and len(self.frame_ms) >= self.decision_interval:
+            return self._decide()
+        return None
+
+    def _ai_ms(self, level):
+        """Expected AI cost per *displayed* frame at `level`."""
+        scale, every = self.levels[level]
+        scale *= self.base_scale
+        return (self.detect_ms.mean() * scale ** 2 + self.infer_ms.mean()) / every
+
+    def _decide(self):
+        frame_ms = self.frame_ms.mean()
+        wall_ms = self.wall_ms.mean()
+        base_ms = max(frame_ms - self._ai_ms(self.level), 0.0)  # Conversion + display overhead
+        action = "hold"
+        projected = frame_ms
+
+        if frame_ms > self.budget_ms and self.level < len(self.levels) - 1:
+            self.level += 1
+            self._healthy_decisions = 0
+            action = "down"
+        elif self.level > 0:
+            projected = base_ms + self._ai_ms(self.level - 1)
+            if projected <= self.budget_ms * self.headroom:
+                self._healthy_decisions += 1
+                if self._healthy_decisions >= self.recover_after:
+                    self.level -= 1
+                    self._healthy_decisions = 0
+                    action = "up"
+            else:
+                self._healthy_decisions = 0
+
+        if action != "hold":
+            # Old samples describe the previous level's frame time; start fresh
+            self.frame_ms.clear()
+            self.wall_ms.clear()
+        self._write(action, frame_ms, wall_ms, projected)
+        return action
+
+    def _write(self, action, frame_ms, wall_ms, projected):
+        if not self._log:
+            return
+        self._writer.writerow([
+            round(time.time(), 3), self._frames, action, self.level, self.detect_scale, self.ai_every,
+            round(frame_ms, 2), round(1000.0 / frame_ms, 1) if frame_ms > 0 else 0.0,
+            round(1000.0 / wall_ms, 1) if wall_ms > 0 else 0.0,
+            round(self.detect_ms.mean(), 2), round(self.infer_ms.mean(), 2), round(projected, 2)
+        ])
+        self._log.flush()
+
+    def close(self):
+        if self._log:
+            self._log.close()
+            self._log = None
+
+    def status(self):
+        return f"L{self.level} det@{self.detect_scale:.2f}x AI 1/{self.ai_every}"
+
+
+def default_log_path():
+    return os.path.join(LOGS_DIR, f"adaptive_{time.strftime('%Y%m%d-%H%M%S')}.csv")
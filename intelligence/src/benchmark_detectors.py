@@ -0,0 +1,90 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from face_detection import available_backends, create_detector, iou
+
+# BENCHMARK CONFIG
+SCALES = [1.0, 0.75, 0.5, 0.33]
+MAX_FRAMES = 300
+IOU_MATCH = 0.4
+
+
+def read_clip(path, max_frames=MAX_FRAMES):
+    """Decodes the clip once so every backend sees identical frames and decode cost is excluded."""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Could not open clip: {path}")
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def reference_boxes(frames):
+    """
+    Pseudo ground truth: the most thorough detector available at full resolution
+    (DNN if its model is on disk, else a fine-stepped Haar cascade).
+    """
+    if "dnn" in available_backends():
+        name, detector = "dnn@1.0", create_detector("dnn", confidence=0.6)
+    else:
+        name, detector = "haar@1.0 (scaleFactor=1.05)", create_detector("haar", scale_factor=1.05, min_neighbors=6)
+    return name, [detector.detect(f) for f in frames]
+
+
+def recall(pred, truth):
+    """Fraction of reference faces matched by a predicted box at IoU >= IOU_MATCH."""
+    hits = total = 0
+    for p_boxes, t_boxes in zip(pred, truth):
+        total += len(t_boxes)
+        hits += sum(any(iou(t, p) >= IOU_MATCH for p in p_boxes) for t in t_boxes)
+    return hits / total if total else float("nan")
+
+
+def run_benchmark(clip_path, scales=SCALES):
+    print(f"🎞️  Loading clip: {clip_path}")
+    frames = read_clip(clip_path)
+    if not frames:
+        print("❌ Error: Clip has no frames.")
+        return
+    h, w = frames[0].shape[:2]
+    print(f"📍 {len(frames)} frames @ {w}x{h} | backends: {', '.join(available_backends())}")
+
+    ref_name, truth = reference_boxes(frames)
+    print(f"🎯 Reference: {ref_name} ({sum(len(t) for t in truth)} faces)")
+
+    print(f"\n{'BACKEND':<10}{'SCALE':>7}{'MEAN ms':>10}{'P95 ms':>10}{'FPS':>8}{'RECALL':>9}{'FACES':>8}")
+    print("-" * 62)
+    for backend in available_backends():
+        for scale in scales:
+            # Live-path defaults (scaleFactor=1.3) so the numbers match what inference_live.py sees
+            kwargs = {"scale_factor": 1.3} if backend in ("haar", "lbp") else {}
+            detector = create_detector(backend, detect_scale=scale, **kwargs)
+            gray_frames = frames if detector.wants_color else [cv2.cvtColor(f, cv2.COLOR_BGR2GRAY) for f in frames]
+
+            detector.detect(gray_frames[0])  # Warm-up (DNN allocates on first forward)
+            times, preds = [], []
+            for f in gray_frames:
+                start = time.perf_counter()
+                preds.append(detector.detect(f))
+                times.append((time.perf_counter() - start) * 1000)
+
+            times = np.array(times)
+            print(f"{backend:<10}{scale:>7.2f}{times.mean():>10.2f}{np.percentile(times, 95):>10.2f}"
+                  f"{1000 / times.mean():>8.0f}{recall(preds, truth):>9.2%}{sum(len(p) for p in preds):>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare face detector backends on a recorded clip.")
+    parser.add_argument("clip", help="Path to a recorded video (e.g. .mp4/.avi)")
+    parser.add_argument("--scales", type=str, default=",".join(str(s) for s in SCALES),
+                        help="Comma-separated detect scales to test")
+    args = parser.parse_args()
+    run_benchmark(args.clip, [float(s) for s in args.scales.split(",")])
@@ -0,0 +1,470 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+# --- CONFIGURATION ---
+TIMELINE_DIR = os.path.join("intelligence", "data", "timeline")
+EMOTIONS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Neutral', 'Sad', 'Surprise']
+NUM_CLASSES = len(EMOTIONS)
+CHUNK_ROWS = 1 << 16        # ~36 min of one face at 30 FPS per chunk
+QUANT_DTYPES = {"uint8": np.uint8, "float16": np.float16}
+FORMAT_VERSION = 1
+ROLLUP_ROW_BYTES = {"minute": 8, "count": 4, "prob_sum": 4 * NUM_CLASSES, "votes": 4 * NUM_CLASSES}
+
+
+def _quantize(probs, dtype):
+    if dtype == np.uint8:
+        return np.clip(np.rint(probs * 255.0), 0, 255).astype(np.uint8)
+    return probs.astype(dtype)
+
+
+def _dequantize(q):
+    if q.dtype == np.uint8:
+        return q.astype(np.float32) / 255.0
+    return q.astype(np.float32)
+
+
+def _minute_rollup(ts, probs):
+    """Collapses sorted rows into per-minute (minute, count, prob_sum[7], votes[7])."""
+    if len(ts) == 0:
+        return (np.empty(0, np.int64), np.empty(0, np.int32),
+                np.empty((0, NUM_CLASSES), np.float32), np.empty((0, NUM_CLASSES), np.int32))
+    minutes = (ts // 60).astype(np.int64)
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(minutes)) + 1])
+    counts = np.diff(np.append(starts, len(ts))).astype(np.int32)
+    prob_sum = np.add.reduceat(probs, starts, axis=0).astype(np.float32)
+    votes = np.add.reduceat(np.eye(NUM_CLASSES, dtype=np.int32)[probs.argmax(axis=1)], starts, axis=0).astype(np.int32)
+    return minutes[starts], counts, prob_sum, votes
+
+
+class TimelineStore:
+    """
+    Append-only, chunked emotion timeline.
+
+    Layout (all raw arrays memory-mapped):
+      index.json                 sealed chunks: rows, t_min/t_max, vote + prob_sum summaries;
+                                 rollup_rows, the committed length of the rollup files
+      active.json                row count of the chunk currently being written
+      chunk_000000_ts.npy        float64 epoch seconds (non-decreasing)
+      chunk_000000_probs.npy     (rows, 7) uint8 or float16 quantized probabilities
+      chunk_000000_face.npy      uint16 face slot within the frame
+      rollup_*.bin               per-minute summaries, appended whenever a chunk is sealed
+
+    Range queries touch the minute rollups plus at most two partial minutes of raw rows,
+    so a week of buckets over months of data never scans the raw chunks.
+    """
+
+    def __init__(self, root=TIMELINE_DIR, quantize="uint8", chunk_rows=CHUNK_ROWS, readonly=False):
+        self.root = root
+        self.readonly = readonly
+        index_path = os.path.join(root, "index.json")
+
+        if os.path.exists(index_path):
+            with open(index_path, "r") as f:
+                self.index = json.load(f)
+        elif readonly:
+            raise FileNotFoundError(f"No timeline at {root}")
+        else:
+            os.makedirs(root, exist_ok=True)
+            self.index = {"version": FORMAT_VERSION, "quantize": quantize, "chunk_rows": chunk_rows,
+                          "chunks": [], "rollup_rows": 0}
+            self._write_index()
+
+        if "rollup_rows" not in self.index:
+            # Written before rollup_rows existed: trust the files as they are
+            minute_path = self._path("rollup_minute.bin")
+            self.index["rollup_rows"] = os.path.getsize(minute_path) // 8 if os.path.exists(minute_path) else 0
+        if not readonly:
+            self._truncate_rollups()
+
+        self.dtype = QUANT_DTYPES[self.index["quantize"]]
+        self.chunk_rows = self.index["chunk_rows"]
+        self._chunk_cache = {}
+        self._bounds = None
+        self._rollup = None
+        self._active = None
+        self._load_active()
+
+    # --- PATHS & METADATA ---
+    def _path(self, name):
+        return os.path.join(self.root, name)
+
+    def _chunk_path(self, chunk_id, field):
+        return self._path(f"chunk_{chunk_id:06d}_{field}.npy")
+
+    def _write_json(self, name, data):
+        tmp = self._path(name + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self._path(name))  # Atomic: a crash never leaves a torn index
+
+    def _write_index(self):
+        self._write_json("index.json", self.index)
+
+    def _truncate_rollups(self):
+        """Drops rollup rows a crash left behind after appending them but before the index committed."""
+        n = self.index["rollup_rows"]
+        for name, row_bytes in ROLLUP_ROW_BYTES.items():
+            path = self._path(f"rollup_{name}.bin")
+            if os.path.exists(path) and os.path.getsize(path) > n * row_bytes:
+                os.truncate(path, n * row_bytes)
+
+    # --- ACTIVE CHUNK ---
+    def _load_active(self):
+        active_path = self._path("active.json")
+        if not os.path.exists(active_path):
+            return
+        with open(active_path, "r") as f:
+            meta = json.load(f)
+        if meta["id"] < len(self.index["chunks"]):
+            # Crashed after the seal committed but before active.json was removed
+            if not self.readonly:
+                os.remove(active_path)
+            return
+        mode = "r" if self.readonly else "r+"
+        self._active = {
+            "id": meta["id"],
+            "rows": meta["rows"],
+            "ts": np.load(self._chunk_path(meta["id"], "ts"), mmap_mode=mode),
+            "probs": np.load(self._chunk_path(meta["id"], "probs"), mmap_mode=mode),
+            "face": np.load(self._chunk_path(meta["id"], "face"), mmap_mode=mode),
+        }
+
+    def _open_new_chunk(self):
+        chunk_id = len(self.index["chunks"])
+        open_memmap = np.lib.format.open_memmap
+        self._active = {
+            "id": chunk_id,
+            "rows": 0,
+            "ts": open_memmap(self._chunk_path(chunk_id, "ts"), "w+", np.float64, (self.chunk_rows,)),
+            "probs": open_memmap(self._chunk_path(chunk_id, "probs"), "w+", self.dtype, (self.chunk_rows, NUM_CLASSES)),
+            "face": open_memmap(self._chunk_path(chunk_id, "face"), "w+", np.uint16, (self.chunk_rows,)),
+        }
+        self._write_active()
+
+    def _write_active(self):
+        self._write_json("active.json", {"id": self._active["id"], "rows": self._active["rows"]})
+
+    def _seal_active(self):
+        """
+        Freezes the full active chunk: minute rollup onto the rollup files, then summary into the index.
+        The index write is the commit point; rollup rows past index['rollup_rows'] are discarded on open.
+        """
+        a = self._active
+        rows = a["rows"]
+        for field in ("ts", "probs", "face"):
+            a[field].flush()
+        ts = np.asarray(a["ts"][:rows])
+        probs = _dequantize(np.asarray(a["probs"][:rows]))
+
+        minutes, counts, prob_sum, votes = _minute_rollup(ts, probs)
+        for name, arr in (("minute", minutes), ("count", counts), ("prob_sum", prob_sum), ("votes", votes)):
+            with open(self._path(f"rollup_{name}.bin"), "ab") as f:
+                f.write(np.ascontiguousarray(arr).tobytes())
+
+        self.index["chunks"].append({
+            "id": a["id"],
+            "rows": rows,
+            "t_min": float(ts[0]),
+            "t_max": float(ts[-1]),
+            "votes": votes.sum(axis=0).tolist(),
+            "prob_sum": prob_sum.sum(axis=0).astype(float).tolist(),
+        })
+        self.index["rollup_rows"] += len(minutes)
+        self._write_index()
+        os.remove(self._path("active.json"))
+        self._active = None
+        self._rollup = None
+
+    # --- WRITING ---
+    def append(self, timestamps, probs, face_ids=None):
+        """
+        timestamps: (N,) epoch seconds; probs: (N, 7) floats in [0, 1].
+        Timestamps are clamped to be non-decreasing so range lookups can binary search.
+        """
+        if self.readonly:
+            raise PermissionError("TimelineStore opened read-only")
+        ts = np.atleast_1d(np.asarray(timestamps, dtype=np.float64))
+        probs = np.asarray(probs, dtype=np.float32).reshape(-1, NUM_CLASSES)
+        faces = np.zeros(len(ts), np.uint16) if face_ids is None else np.asarray(face_ids, dtype=np.uint16)
+        if not (len(ts) == len(probs) == len(faces)):
+            raise ValueError("timestamps, probs and face_ids must have the same length")
+
+        last = self._last_timestamp()
+        if last is not None:
+            ts = np.maximum(ts, last)
+        ts = np.maximum.accumulate(ts)
+        q = _quantize(probs, self.dtype)
+
+        written = 0
+        while written < len(ts):
+            if self._active is None:
+                self._open_new_chunk()
+            a = self._active
+            take = min(self.chunk_rows - a["rows"], len(ts) - written)
+            sl = slice(a["rows"], a["rows"] + take)
+            a["ts"][sl] = ts[written:written + take]
+            a["probs"][sl] = q[written:written + take]
+            a["face"][sl] = faces[written:written + take]
+            a["rows"] += take
+            written += take
+            if a["rows"] == self.chunk_rows:
+                self._seal_active()
+
+    def _last_timestamp(self):
+        if self._active is not None and self._active["rows"]:
+            return float(self._active["ts"][self._active["rows"] - 1])
+        if self.index["chunks"]:
+            return self.index["chunks"][-1]["t_max"]
+        return None
+
+    def flush(self):
+        """Makes appended rows durable and visible to readers."""
+        if self._active is not None and not self.readonly:
+            for field in ("ts", "probs", "face"):
+                self._active[field].flush()
+            self._write_active()
+
+    def close(self):
+        self.flush()
+        self._active = None
+        self._chunk_cache.clear()
+
+    # --- READING ---
+    def __len__(self):
+        sealed = sum(c["rows"] for c in self.index["chunks"])
+        return sealed + (self._active["rows"] if self._active else 0)
+
+    def _chunk_range(self, start, end):
+        """
+        Sealed chunks overlapping [start, end), found by bisecting the index summaries.
+        Timestamps never decrease, so both t_min and t_max are sorted across chunks.
+        """
+        chunks = self.index["chunks"]
+        if self._bounds is None or len(self._bounds[0]) != len(chunks):
+            self._bounds = (np.array([c["t_min"] for c in chunks], np.float64),
+                            np.array([c["t_max"] for c in chunks], np.float64))
+        t_min, t_max = self._bounds
+        lo = np.searchsorted(t_max, start, "left")
+        hi = np.searchsorted(t_min, end, "left")
+        return chunks[lo:hi]
+
+    def _chunk_arrays(self, c):
+        if c["id"] not in self._chunk_cache:
+            self._chunk_cache[c["id"]] = tuple(
+                np.load(self._chunk_path(c["id"], f), mmap_mode="r")[:c["rows"]] for f in ("ts", "probs", "face"))
+        return self._chunk_cache[c["id"]]
+
+    def _segments(self, start, end):
+        """(ts, probs_q, face) views for the chunks overlapping [start, end), sealed then active."""
+        for c in self._chunk_range(start, end):
+            yield self._chunk_arrays(c)  # Out-of-range chunks are pruned by the index, never opened
+        if self._active is not None and self._active["rows"]:
+            a, n = self._active, self._active["rows"]
+            yield a["ts"][:n], a["probs"][:n], a["face"][:n]
+
+    def read(self, start, end):
+        """Raw rows with start <= t < end as (timestamps, float32 probs, face_ids)."""
+        ts_out, probs_out, face_out = [], [], []
+        for ts, probs, face in self._segments(start, end):
+            lo, hi = np.searchsorted(ts, start, "left"), np.searchsorted(ts, end, "left")
+            if hi > lo:
+                ts_out.append(np.asarray(ts[lo:hi]))
+                probs_out.append(_dequantize(np.asarray(probs[lo:hi])))
+                face_out.append(np.asarray(face[lo:hi]))
+        if not ts_out:
+            return np.empty(0), np.empty((0, NUM_CLASSES), np.float32), np.empty(0, np.uint16)
+        return np.concatenate(ts_out), np.concatenate(probs_out), np.concatenate(face_out)
+
+    def _load_rollup(self):
+        """Sealed per-minute rollups (memory-mapped, cached until the next seal)."""
+        if self._rollup is None:
+            n = self.index["rollup_rows"]  # Not the file size: a read-only reader can't truncate a torn seal
+            if n == 0:
+                self._rollup = _minute_rollup(np.empty(0), np.empty((0, NUM_CLASSES), np.float32))
+            else:
+                self._rollup = (
+                    np.memmap(self._path("rollup_minute.bin"), np.int64, "r", shape=(n,)),
+                    np.memmap(self._path("rollup_count.bin"), np.int32, "r", shape=(n,)),
+                    np.memmap(self._path("rollup_prob_sum.bin"), np.float32, "r", shape=(n, NUM_CLASSES)),
+                    np.memmap(self._path("rollup_votes.bin"), np.int32, "r", shape=(n, NUM_CLASSES)),
+                )
+        return self._rollup
+
+    def dominant_per_bucket(self, start, end, bucket_sec=60, method="mean"):
+        """
+        Dominant emotion per `bucket_sec` bucket (epoch-aligned) over [start, end).
+        method: 'mean' = highest average probability, 'vote' = most frequent top-1.
+        Returns (bucket_start_times, dominant_idx, row_counts) for non-empty buckets.
+        """
+        keys, counts, prob_sums, votes = [], [], [], []
+
+        if bucket_sec % 60 == 0:
+            # Whole minutes come from rollups; only the ragged edges are scanned raw
+            first_full = np.ceil(start / 60) * 60
+            last_full = np.floor(end / 60) * 60
+            if first_full < last_full:
+                lo_min, hi_min = int(first_full // 60), int(last_full // 60)
+                m, c, p, v = self._load_rollup()
+                lo, hi = np.searchsorted(m, lo_min, "left"), np.searchsorted(m, hi_min, "left")
+                keys.append(np.asarray(m[lo:hi]) * 60.0)
+                counts.append(np.asarray(c[lo:hi]))
+                prob_sums.append(np.asarray(p[lo:hi]))
+                votes.append(np.asarray(v[lo:hi]))
+
+                if self._active is not None and self._active["rows"]:
+                    n = self._active["rows"]
+                    a_ts = np.asarray(self._active["ts"][:n])
+                    a_lo, a_hi = np.searchsorted(a_ts, first_full), np.searchsorted(a_ts, last_full)
+                    am, ac, ap, av = _minute_rollup(a_ts[a_lo:a_hi], _dequantize(np.asarray(self._active["probs"][a_lo:a_hi])))
+                    keys.append(am * 60.0)
+                    counts.append(ac)
+                    prob_sums.append(ap)
+                    votes.append(av)
+                raw_ranges = [(start, first_full), (last_full, end)]
+            else:
+                raw_ranges = [(start, end)]
+        else:
+            raw_ranges = [(start, end)]
+
+        for lo_t, hi_t in raw_ranges:
+            if hi_t <= lo_t:
+                continue
+            ts, probs, _ = self.read(lo_t, hi_t)
+            keys.append(ts)
+            counts.append(np.ones(len(ts), np.int32))
+            prob_sums.append(probs)
+            votes.append(np.eye(NUM_CLASSES, dtype=np.int32)[probs.argmax(axis=1)] if len(ts) else
+                         np.empty((0, NUM_CLASSES), np.int32))
+
+        keys = np.concatenate(keys) if keys else np.empty(0)
+        if len(keys) == 0:
+            return np.empty(0), np.empty(0, np.int64), np.empty(0, np.int64)
+
+        buckets = np.floor(keys / bucket_sec).astype(np.int64)
+        uniq, inv = np.unique(buckets, return_inverse=True)
+        bucket_counts = np.bincount(inv, weights=np.concatenate(counts), minlength=len(uniq)).astype(np.int64)
+        source = np.concatenate(prob_sums) if method == "mean" else np.concatenate(votes)
+        totals = np.zeros((len(uniq), NUM_CLASSES), np.float64)
+        np.add.at(totals, inv, source)
+
+        keep = bucket_counts > 0
+        return uniq[keep] * float(bucket_sec), totals[keep].argmax(axis=1), bucket_counts[keep]
+
+    def distribution(self, start=-np.inf, end=np.inf):
+        """Mean probability and top-1 vote counts over [start, end), using chunk summaries where possible."""
+        prob_sum = np.zeros(NUM_CLASSES)
+        votes = np.zeros(NUM_CLASSES, np.int64)
+        rows = 0
+        partial = []
+        for c in self._chunk_range(start, end):
+            if c["t_min"] >= start and c["t_max"] < end:
+                prob_sum += c["prob_sum"]
+                votes += c["votes"]
+                rows += c["rows"]
+            else:
+                partial.append(self._chunk_arrays(c))
+        if self._active is not None and self._active["rows"]:
+            a, n = self._active, self._active["rows"]
+            partial.append((a["ts"][:n], a["probs"][:n], a["face"][:n]))
+
+        for ts, probs, _ in partial:
+            lo, hi = np.searchsorted(ts, start, "left"), np.searchsorted(ts, end, "left")
+            p = _dequantize(np.asarray(probs[lo:hi]))
+            prob_sum += p.sum(axis=0)
+            votes += np.bincount(p.argmax(axis=1), minlength=NUM_CLASSES) if len(p) else 0
+            rows += len(p)
+        return (prob_sum / rows if rows else prob_sum), votes, rows
+
+
+class TimelineWriter:
+    """
+    Non-blocking front end for the live loop: `append()` only enqueues; a daemon thread
+    batches rows into the store and flushes every `flush_sec`. If the queue is full the
+    frame is dropped (and counted) rather than stalling the display.
+
+    A store error stops the thread and is kept in `error`; later frames are dropped and
+    close() still returns, so a full disk never hangs the live loop on exit.
+    """
+
+    def __init__(self, store=None, max_queue=4096, flush_sec=2.0):
+        self.store = store if store is not None else TimelineStore()
+        self.flush_sec = flush_sec
+        self.dropped = 0
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="spectra-timeline", daemon=True)
+        self._thread.start()
+
+    def append(self, probs, timestamp=None, face_ids=None):
+        """probs: (N, 7) for the N faces of one frame."""
+        probs = np.array(probs, dtype=np.float32, copy=True).reshape(-1, NUM_CLASSES)
+        ts = np.full(len(probs), time.time() if timestamp is None else timestamp)
+        faces = np.arange(len(probs)) if face_ids is None else face_ids
+        if self.error is not None:
+            self.dropped += 1
+            return
+        try:
+            self._queue.put_nowait((ts, probs, faces))
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        try:
+            self._drain()
+        except Exception as e:  # Anything the store raises; surfaced via `error` instead of dying silently
+            self.error = e
+
+    def _drain(self):
+        last_flush = time.monotonic()
+        running = True
+        while running:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_sec))
+                while len(batch) < 1024:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            if batch and batch[-1] is None:
+                batch.pop()
+                running = False
+            if batch:
+                self.store.append(np.concatenate([b[0] for b in batch]),
+                                  np.concatenate([b[1] for b in batch]),
+                                  np.concatenate([b[2] for b in batch]))
+            if not running or time.monotonic() - last_flush >= self.flush_sec:
+                self.store.flush()
+                last_flush = time.monotonic()
+
+    def close(self):
+        # Only a live thread drains the queue, so never block on a sentinel nobody will read
+        while self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        try:
+            self.store.close()
+        except Exception as e:
+            self.error = self.error or e
+
+
+if __name__ == "__main__":
+    store = TimelineStore(readonly=True)
+    now = time.time()
+    print(f"🗂️  Timeline: {len(store)} rows in {TIMELINE_DIR}")
+
+    start = time.perf_counter()
+    buckets, dominant, counts = store.dominant_per_bucket(now - 7 * 86400, now, bucket_sec=60)
+    ms = (time.perf_counter() - start) * 1000
+    print(f"⏱️  Dominant emotion per minute, last 7 days: {len(buckets)} minutes in {ms:.1f} ms")
+    for t, d, n in list(zip(buckets, dominant, counts))[-10:]:
+        print(f"  {time.strftime('%Y-%m-%d %H:%M', time.localtime(t))}  {EMOTIONS[d]:<9} ({n} frames)")
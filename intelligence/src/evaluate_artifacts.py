@@ -0,0 +1,208 @@
+import argparse
+import glob
+import json
+import multiprocessing as mp
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from numpy_engine import NumpyEngine
+
+# --- CONFIG ---
+MODELS_DIR = os.path.join("intelligence", "models")
+MOBILE_ASSET_DIR = os.path.join("platforms", "mobile", "assets")
+WEB_MODEL_DIR = os.path.join("platforms", "web", "public", "models")
+LOGS_DIR = os.path.join("intelligence", "logs")
+
+KERAS_PATH = os.path.join(MODELS_DIR, "spectra_best_model.keras")
+# Label order of data_loader.EMOTIONS. Copied rather than imported: data_loader pulls in
+# TensorFlow and OpenCV, and spawned workers re-import this module.
+EMOTIONS = ['angry', 'disgust', 'fear', 'happy', 'neutral', 'sad', 'surprise']
+EVAL_BATCH = 1024
+NUMPY_BATCH = 64  # im2col scratch grows with the batch: ~2.7 MB per image at the widest 48x48 layer
+
+
+def discover_artifacts():
+    """Every exported artifact on disk, as (name, kind, path). Keras first: it is the reference."""
+    artifacts = []
+    if os.path.exists(KERAS_PATH):
+        artifacts.append(("keras", "keras", KERAS_PATH))
+    for path in sorted(glob.glob(os.path.join(MODELS_DIR, "*.tflite")) + glob.glob(os.path.join(MOBILE_ASSET_DIR, "*.tflite"))):
+        artifacts.append((os.path.relpath(path), "tflite", path))
+    if os.path.exists(os.path.join(WEB_MODEL_DIR, "model.json")):
+        artifacts.append(("tfjs", "tfjs", WEB_MODEL_DIR))
+    return artifacts
+
+
+# --- RUNNERS (executed inside worker processes) ---
+def _predict_keras(model, X):
+    return np.concatenate([model.predict_on_batch(X[i:i + EVAL_BATCH]) for i in range(0, len(X), EVAL_BATCH)])
+
+
+def _predict_tflite(path, X, num_threads):
+    import tensorflow as tf
+
+    interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads)
+    inp = interpreter.get_input_details()[0]
+    out = interpreter.get_output_details()[0]
+    in_scale, in_zero = inp["quantization"]
+    out_scale, out_zero = out["quantization"]
+
+    allocated = None
+    probs = []
+    for i in range(0, len(X), EVAL_BATCH):
+        chunk = X[i:i + EVAL_BATCH]
+        if allocated != len(chunk):
+            interpreter.resize_tensor_input(inp["index"], [len(chunk), 48, 48, 1])
+            interpreter.allocate_tensors()
+            allocated = len(chunk)
+
+        # Quantized (int8/uint8) inputs need the float batch mapped into their integer domain
+        if in_scale:
+            info = np.iinfo(inp["dtype"])
+            chunk = np.clip(np.round(chunk / in_scale + in_zero), info.min, info.max)
+        interpreter.set_tensor(inp["index"], np.ascontiguousarray(chunk, dtype=inp["dtype"]))
+        interpreter.invoke()
+
+        result = interpreter.get_tensor(out["index"]).astype(np.float32)
+        if out_scale:
+            result = (result - out_zero) * out_scale
+        probs.append(result)
+    return np.concatenate(probs)
+
+
+def _import_tf(num_threads):
+    """TensorFlow is only imported by the workers that need it; the tfjs worker never pays for it."""
+    os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(num_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    return tf
+
+
+def _run_artifact(kind, path, x_path, num_threads):
+    X = np.load(x_path, mmap_mode="r")
+    if kind in ("keras", "tflite"):
+        tf = _import_tf(num_threads)
+    start = time.perf_counter()
+
+    if kind == "keras":
+        probs = _predict_keras(tf.keras.models.load_model(path), X)
+    elif kind == "tflite":
+        probs = _predict_tflite(path, X, num_threads)
+    elif kind == "tfjs":
+        from threadpoolctl import threadpool_limits
+
+        # Scored straight from the shard, independent of TensorFlow's own weight loading.
+        # The GEMMs run in BLAS, which otherwise spawns a thread per core in every worker.
+        with threadpool_limits(limits=num_threads, user_api="blas"):
+            probs = NumpyEngine(path).predict(X, batch_size=NUMPY_BATCH)
+    else:
+        raise ValueError(f"Unknown artifact kind: {kind}")
+
+    return probs.astype(np.float32), time.perf_counter() - start
+
+
+# --- METRICS ---
+def confusion_matrix(y_true, y_pred, num_classes=len(EMOTIONS)):
+    return np.bincount(y_true * num_classes + y_pred, minlength=num_classes ** 2).reshape(num_classes, num_classes)
+
+
+def score_artifact(probs, y_true, reference=None):
+    y_pred = probs.argmax(axis=1)
+    cm = confusion_matrix(y_true, y_pred)
+    support = np.maximum(cm.sum(axis=1), 1)
+    report = {
+        "accuracy": float((y_pred == y_true).mean()),
+        "per_class_recall": {e: float(cm[i, i] / support[i]) for i, e in enumerate(EMOTIONS)},
+        "confusion": cm.tolist(),
+    }
+    if reference is not None:
+        drift = np.abs(probs - reference)
+        report["top1_agreement"] = float((y_pred == reference.argmax(axis=1)).mean())
+        report["max_prob_drift"] = float(drift.max())
+        report["mean_prob_drift"] = float(drift.mean())
+    return report
+
+
+def evaluate_all(workers=None):
+    print("🧪 Spectra Artifact Parity Evaluator")
+    from data_loader import TEST_DIR, load_data_from_disk  # Parent only (TensorFlow + OpenCV)
+
+    artifacts = discover_artifacts()
+    if not artifacts:
+        print("❌ Error: No exported artifacts found.")
+        return None
+
+    X_test, y_test = load_data_from_disk(TEST_DIR)
+    if len(X_test) == 0:
+        print(f"❌ Error: Test split is empty ({TEST_DIR}).")
+        return None
+    y_true = y_test.argmax(axis=1)
+
+    workers = workers or min(len(artifacts), os.cpu_count() or 1)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    print(f"🚀 Scoring {len(artifacts)} artifacts on {len(X_test)} images ({workers} procs x {threads} threads)...")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Workers memory-map one copy of the test split instead of each receiving a pickle
+        x_path = os.path.join(tmp, "x_test.npy")
+        np.save(x_path, X_test)
+
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+            futures = {name: pool.submit(_run_artifact, kind, path, x_path, threads) for name, kind, path in artifacts}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"⚠️  {name} failed: {e}")
+        wall = time.perf_counter() - start
+
+    if not results:
+        return None
+
+    ref_name = next(iter(results))
+    reference = results[ref_name][0]
+    report = {"reference": ref_name, "samples": int(len(y_true)), "wall_sec": round(wall, 2), "artifacts": {}}
+    for name, (probs, seconds) in results.items():
+        entry = score_artifact(probs, y_true, None if name == ref_name else reference)
+        entry["seconds"] = round(seconds, 2)
+        report["artifacts"][name] = entry
+
+    print_report(report)
+
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    out_path = os.path.join(LOGS_DIR, f"parity_{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Report saved: {out_path}")
+    return report
+
+
+def print_report(report):
+    print(f"\n📊 PARITY REPORT (reference: {report['reference']}, {report['samples']} images, {report['wall_sec']}s)")
+    print("-" * 96)
+    print(f"{'ARTIFACT':<44}{'ACC':>8}{'AGREE':>9}{'MAX DRIFT':>12}{'MEAN DRIFT':>12}{'TIME':>9}")
+    for name, r in report["artifacts"].items():
+        agree = f"{r['top1_agreement']:.2%}" if "top1_agreement" in r else "ref"
+        max_d = f"{r['max_prob_drift']:.5f}" if "max_prob_drift" in r else "-"
+        mean_d = f"{r['mean_prob_drift']:.6f}" if "mean_prob_drift" in r else "-"
+        print(f"{name:<44}{r['accuracy']:>8.2%}{agree:>9}{max_d:>12}{mean_d:>12}{r['seconds']:>8.1f}s")
+
+    print("\n🎯 Per-class recall")
+    print(f"{'ARTIFACT':<44}" + "".join(f"{e[:7]:>9}" for e in EMOTIONS))
+    for name, r in report["artifacts"].items():
+        print(f"{name:<44}" + "".join(f"{r['per_class_recall'][e]:>9.2%}" for e in EMOTIONS))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every exported Spectra artifact on the full test split.")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per artifact)")
+    args = parser.parse_args()
+    evaluate_all(workers=args.workers)
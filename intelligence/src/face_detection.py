@@ -0,0 +1,180 @@
+import os
+
+import cv2
+import numpy as np
+
+# --- CONFIGURATION ---
+FACE_MODELS_DIR = os.path.join("intelligence", "models", "face_detector")
+HAAR_PATH = os.path.join(cv2.data.haarcascades, "haarcascade_frontalface_default.xml")
+# LBP cascades are not shipped with opencv-python; drop one from opencv/data/lbpcascades here
+LBP_PATH = os.path.join(FACE_MODELS_DIR, "lbpcascade_frontalface_improved.xml")
+# OpenCV's res10 SSD face detector (deploy.prototxt + weights from opencv/samples/dnn)
+DNN_PROTO_PATH = os.path.join(FACE_MODELS_DIR, "deploy.prototxt")
+DNN_WEIGHTS_PATH = os.path.join(FACE_MODELS_DIR, "res10_300x300_ssd_iter_140000.caffemodel")
+
+
+def clip_box(box, frame_shape):
+    """Clamps (x, y, w, h) to the frame; returns None if nothing is left."""
+    x, y, w, h = box
+    H, W = frame_shape[:2]
+    x0, y0 = max(0, int(x)), max(0, int(y))
+    x1, y1 = min(W, int(x + w)), min(H, int(y + h))
+    if x1 <= x0 or y1 <= y0:
+        return None
+    return (x0, y0, x1 - x0, y1 - y0)
+
+
+def expand_box(box, margin, frame_shape):
+    """Grows a box by `margin` (fraction of its size) on every side, clipped to the frame."""
+    x, y, w, h = box
+    dx, dy = w * margin, h * margin
+    return clip_box((x - dx, y - dy, w + 2 * dx, h + 2 * dy), frame_shape)
+
+
+def union_box(boxes):
+    boxes = np.asarray(boxes)
+    x0, y0 = boxes[:, 0].min(), boxes[:, 1].min()
+    x1, y1 = (boxes[:, 0] + boxes[:, 2]).max(), (boxes[:, 1] + boxes[:, 3]).max()
+    return (int(x0), int(y0), int(x1 - x0), int(y1 - y0))
+
+
+def iou(a, b):
+    ax1, ay1, bx1, by1 = a[0] + a[2], a[1] + a[3], b[0] + b[2], b[1] + b[3]
+    iw = max(0, min(ax1, bx1) - max(a[0], b[0]))
+    ih = max(0, min(ay1, by1) - max(a[1], b[1]))
+    inter = iw * ih
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union > 0 else 0.0
+
+
+class FaceDetector:
+    """
+    Base detector. Subclasses implement `_detect(img)` on whatever they are handed;
+    this class handles downscaling, ROI restriction and mapping boxes back to full-res.
+
+    detect_scale: run the backend on a frame resized by this factor (0.5 = quarter the pixels).
+    """
+
+    name = "base"
+    wants_color = False
+
+    def __init__(self, detect_scale=1.0, min_size=(30, 30)):
+        if not 0 < detect_scale <= 1:
+            raise ValueError(f"detect_scale must be in (0, 1], got {detect_scale}")
+        self.detect_scale = detect_scale
+        self.min_size = min_size
+
+    def _detect(self, img, min_size):
+        raise NotImplementedError
+
+    def detect(self, frame, roi=None):
+        """
+        frame: grayscale (H, W) or BGR (H, W, 3) full-resolution image.
+        roi: optional (x, y, w, h) in full-res coords; only this region is searched.
+        Returns a list of (x, y, w, h) boxes in full-res coords.
+        """
+        if frame.ndim == 3 and not self.wants_color:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        elif frame.ndim == 2 and self.wants_color:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+        ox, oy = 0, 0
+        if roi is not None:
+            roi = clip_box(roi, frame.shape)
+            if roi is None:
+                return []
+            ox, oy, rw, rh = roi
+            frame = frame[oy:oy + rh, ox:ox + rw]
+
+        scale = self.detect_scale
+        if scale != 1.0:
+            frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        # min_size is specified at full resolution
+        min_size = (max(1, int(self.min_size[0] * scale)), max(1, int(self.min_size[1] * scale)))
+
+        boxes = []
+        for (x, y, w, h) in self._detect(frame, min_size):
+            boxes.append((int(x / scale) + ox, int(y / scale) + oy, int(w / scale), int(h / scale)))
+        return boxes
+
+
+class CascadeDetector(FaceDetector):
+    """Shared logic for Haar and LBP cascades."""
+
+    def __init__(self, cascade_path, scale_factor=1.1, min_neighbors=5, **kwargs):
+        super().__init__(**kwargs)
+        if not os.path.exists(cascade_path):
+            raise FileNotFoundError(f"Cascade not found: {cascade_path}")
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise ValueError(f"Failed to load cascade: {cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+
+    def _detect(self, img, min_size):
+        faces = self.cascade.detectMultiScale(img, scaleFactor=self.scale_factor,
+                                              minNeighbors=self.min_neighbors, minSize=min_size)
+        return [tuple(f) for f in faces]
+
+
+class HaarDetector(CascadeDetector):
+    name = "haar"
+
+    def __init__(self, cascade_path=HAAR_PATH, **kwargs):
+        super().__init__(cascade_path, **kwargs)
+
+
+class LbpDetector(CascadeDetector):
+    name = "lbp"
+
+    def __init__(self, cascade_path=LBP_PATH, **kwargs):
+        super().__init__(cascade_path, **kwargs)
+
+
+class DnnDetector(FaceDetector):
+    """OpenCV DNN (res10 SSD). Needs the model files in FACE_MODELS_DIR."""
+
+    name = "dnn"
+    wants_color = True
+
+    def __init__(self, proto_path=DNN_PROTO_PATH, weights_path=DNN_WEIGHTS_PATH,
+                 confidence=0.5, input_size=(300, 300), **kwargs):
+        super().__init__(**kwargs)
+        if not (os.path.exists(proto_path) and os.path.exists(weights_path)):
+            raise FileNotFoundError(f"DNN face model not found in {os.path.dirname(proto_path)}")
+        self.net = cv2.dnn.readNetFromCaffe(proto_path, weights_path)
+        self.confidence = confidence
+        self.input_size = input_size
+
+    def _detect(self, img, min_size):
+        h, w = img.shape[:2]
+        blob = cv2.dnn.blobFromImage(img, 1.0, self.input_size, (104.0, 177.0, 123.0))
+        self.net.setInput(blob)
+        detections = self.net.forward()[0, 0]  # (N, 7): [_, _, conf, x0, y0, x1, y1]
+
+        keep = detections[detections[:, 2] >= self.confidence]
+        boxes = []
+        for x0, y0, x1, y1 in keep[:, 3:7] * np.array([w, h, w, h]):
+            box = clip_box((x0, y0, x1 - x0, y1 - y0), img.shape)
+            if box and box[2] >= min_size[0] and box[3] >= min_size[1]:
+                boxes.append(box)
+        return boxes
+
+
+BACKENDS = {"haar": HaarDetector, "lbp": LbpDetector, "dnn": DnnDetector}
+
+
+def available_backends():
+    """Backends whose model files are present on this machine."""
+    names = ["haar"]
+    if os.path.exists(LBP_PATH):
+        names.append("lbp")
+    if os.path.exists(DNN_PROTO_PATH) and os.path.exists(DNN_WEIGHTS_PATH):
+        names.append("dnn")
+    return names
+
+
+def create_detector(backend="haar", **kwargs):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{backend}'. Choose from {list(BACKENDS)}")
+    return BACKENDS[backend](**kwargs)
@@ -0,0 +1,242 @@
+import argparse
+import csv
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from data_loader import get_data_generators
+from model_builder import build_spectra_cnn
+from train import build_train_dataset
+
+# SEARCH CONFIG
+LOGS_DIR = os.path.join("intelligence", "logs")
+SEARCH_SPACE = {
+    "lr": (1e-4, 3e-3),                 # log-uniform
+    "batch_size": [64, 128, 256],       # choice
+    "conv_dropout": (0.1, 0.4),         # uniform
+    "dense_dropout": (0.3, 0.6),        # uniform
+}
+RESULT_FIELDS = ["trial", "lr", "batch_size", "conv_dropout", "dense_dropout",
+                 "rung", "epochs", "val_accuracy", "best_val_accuracy", "samples_per_sec", "train_sec", "val_sec", "fit_sec", "status"]
+
+
+def sample_config(rng):
+    lo, hi = SEARCH_SPACE["lr"]
+    return {
+        "lr": float(math.exp(rng.uniform(math.log(lo), math.log(hi)))),
+        "batch_size": int(rng.choice(SEARCH_SPACE["batch_size"])),
+        "conv_dropout": round(float(rng.uniform(*SEARCH_SPACE["conv_dropout"])), 3),
+        "dense_dropout": round(float(rng.uniform(*SEARCH_SPACE["dense_dropout"])), 3),
+    }
+
+
+def rung_schedule(min_epochs, max_epochs, eta):
+    """Epoch budgets per rung: min, min*eta, ... capped at max."""
+    if eta < 2 or not 1 <= min_epochs <= max_epochs:
+        raise ValueError(f"Need eta >= 2 and 1 <= min_epochs <= max_epochs, got eta={eta}, "
+                         f"min_epochs={min_epochs}, max_epochs={max_epochs}")
+    rungs = [min_epochs]
+    while rungs[-1] < max_epochs:
+        rungs.append(min(rungs[-1] * eta, max_epochs))
+    return rungs
+
+
+def halve(survivors, ran, eta, is_last):
+    """
+    One successive-halving cut. `ran` is the prefix of `survivors` that trained this rung
+    (shorter when the budget ran out). Returns (promoted, stopped, skipped): the top 1/eta
+    of `ran` by best val accuracy (none on the last rung), the rest of `ran` ranked, and
+    the survivors the budget never reached, which keep their previous rung's score.
+    """
+    ranked = sorted(ran, key=lambda t: t.best_val_acc, reverse=True)
+    keep = 0 if is_last else max(1, len(ranked) // eta)
+    return ranked[:keep], ranked[keep:], survivors[len(ran):]
+
+
+class StopAtDeadline(tf.keras.callbacks.Callback):
+    """Ends fit() at the first epoch boundary past `deadline`, so the budget overruns by at most one epoch."""
+
+    def __init__(self, deadline):
+        super().__init__()
+        self.deadline = deadline
+
+    def on_epoch_end(self, epoch, logs=None):
+        if time.perf_counter() > self.deadline:
+            self.model.stop_training = True
+
+
+class FitTimer(tf.keras.callbacks.Callback):
+    """
+    Splits fit() into training-step time and validation time. The first training step is
+    left out: it traces the freshly built (or reloaded) model and would swamp a 1-epoch rung.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.train_sec = 0.0
+        self.val_sec = 0.0
+        self._traced = False
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self._batch_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        if self._traced:
+            self.train_sec += time.perf_counter() - self._batch_start
+        self._traced = True
+
+    def on_test_begin(self, logs=None):
+        self._val_start = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        self.val_sec += time.perf_counter() - self._val_start
+
+
+class Trial:
+    def __init__(self, trial_id, config, ckpt_dir):
+        self.trial_id = trial_id
+        self.config = config
+        self.ckpt_path = os.path.join(ckpt_dir, f"trial_{trial_id:03d}.keras")
+        self.epochs = 0
+        self.best_val_acc = 0.0
+        self.last_val_acc = 0.0
+        self.row = {}
+
+    def train_to(self, epochs, data, deadline=None):
+        (X_train, y_train), val_ds = data
+
+        if os.path.exists(self.ckpt_path):
+            model = tf.keras.models.load_model(self.ckpt_path)
+        else:
+            model = build_spectra_cnn(
+                num_classes=7,
+                conv_dropout=self.config["conv_dropout"],
+                dense_dropout=self.config["dense_dropout"]
+            )
+            model.compile(
+                optimizer=tf.keras.optimizers.Adam(learning_rate=self.config["lr"]),
+                loss='categorical_crossentropy',
+                metrics=['accuracy']
+            )
+
+        train_ds = build_train_dataset(X_train, y_train, self.config["batch_size"])
+        timer = FitTimer()
+        callbacks = [timer] + ([StopAtDeadline(deadline)] if deadline else [])
+        start = time.perf_counter()
+        history = model.fit(train_ds, validation_data=val_ds, initial_epoch=self.epochs, epochs=epochs,
+                            callbacks=callbacks, verbose=0)
+        fit_sec = time.perf_counter() - start
+
+        trained = len(history.history["val_accuracy"])  # Fewer than asked if the deadline hit
+        self.epochs += trained
+        self.last_val_acc = float(history.history["val_accuracy"][-1])
+        self.best_val_acc = max(self.best_val_acc, max(history.history["val_accuracy"]))
+
+        # Park the model on disk (optimizer state included) so only one lives in RAM at a time
+        model.save(self.ckpt_path)
+        del model
+        tf.keras.backend.clear_session()
+
+        # Every sample except the untimed first (always full) batch
+        samples = trained * int(X_train.shape[0]) - self.config["batch_size"]
+        return {
+            "samples_per_sec": samples / timer.train_sec if timer.train_sec > 0 else 0.0,
+            "train_sec": timer.train_sec,
+            "val_sec": timer.val_sec,
+            "fit_sec": fit_sec,
+        }
+
+
+def run_search(trials=27, min_epochs=1, max_epochs=27, eta=3, budget_minutes=None, seed=42):
+    print("🔎 Spectra Successive-Halving Search")
+
+    # 1. Load Data into RAM ONCE for every trial
+    (X_train, y_train), (X_val, y_val), _ = get_data_generators()
+    X_train, y_train = tf.convert_to_tensor(X_train), tf.convert_to_tensor(y_train)
+    val_ds = tf.data.Dataset.from_tensor_slices((X_val, y_val)).batch(256).prefetch(tf.data.AUTOTUNE)
+    data = ((X_train, y_train), val_ds)
+
+    rng = np.random.default_rng(seed)
+    rungs = rung_schedule(min_epochs, max_epochs, eta)
+    deadline = time.perf_counter() + budget_minutes * 60 if budget_minutes else None
+    print(f"📐 {trials} trials | rungs (epochs): {rungs} | eta={eta}" + (f" | budget {budget_minutes} min" if deadline else ""))
+
+    os.makedirs(LOGS_DIR, exist_ok=True)
+    results_path = os.path.join(LOGS_DIR, f"hparam_{time.strftime('%Y%m%d-%H%M%S')}.csv")
+    ckpt_dir = tempfile.mkdtemp(prefix="spectra_hparam_")
+
+    with open(results_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+
+        survivors = [Trial(i, sample_config(rng), ckpt_dir) for i in range(trials)]
+        finished = []
+        try:
+            for rung, epochs in enumerate(rungs):
+                print(f"\n🪜 Rung {rung}: {len(survivors)} trials -> {epochs} epochs")
+                ran = []
+                for trial in survivors:
+                    if deadline and time.perf_counter() > deadline:
+                        print("⏰ Compute budget exhausted, stopping early.")
+                        break
+                    timing = trial.train_to(epochs, data, deadline)
+                    ran.append(trial)
+                    print(f"  #{trial.trial_id:03d} lr={trial.config['lr']:.2e} bs={trial.config['batch_size']:<3} "
+                          f"drop={trial.config['conv_dropout']:.2f}/{trial.config['dense_dropout']:.2f} | "
+                          f"val_acc {trial.last_val_acc:.4f} (best {trial.best_val_acc:.4f}) | "
+                          f"{timing['samples_per_sec']:.0f} samples/s")
+                    trial.row = {**trial.config, "trial": trial.trial_id, "rung": rung, "epochs": trial.epochs,
+                                 "val_accuracy": round(trial.last_val_acc, 5),
+                                 "best_val_accuracy": round(trial.best_val_acc, 5),
+                                 "samples_per_sec": round(timing["samples_per_sec"], 1),
+                                 "train_sec": round(timing["train_sec"], 2), "val_sec": round(timing["val_sec"], 2),
+                                 "fit_sec": round(timing["fit_sec"], 2)}
+
+                # 2. Successive halving: keep the top 1/eta by best val accuracy
+                is_last = rung == len(rungs) - 1 or bool(deadline and time.perf_counter() > deadline)
+                promoted, stopped, skipped = halve(survivors, ran, eta, is_last)
+                for trial in promoted:
+                    writer.writerow({**trial.row, "status": "promoted"})
+                for trial in stopped:
+                    writer.writerow({**trial.row, "status": "stopped"})
+                f.flush()
+
+                finished.extend(stopped + skipped)
+                survivors = promoted
+                if not survivors:
+                    break
+        finally:
+            shutil.rmtree(ckpt_dir, ignore_errors=True)
+
+    leaderboard = sorted(finished, key=lambda t: t.best_val_acc, reverse=True)
+    print("\n🏆 LEADERBOARD")
+    print("-" * 80)
+    for trial in leaderboard[:5]:
+        c = trial.config
+        print(f"  #{trial.trial_id:03d} best_val_acc={trial.best_val_acc:.4f} @ {trial.epochs} ep | "
+              f"LR={c['lr']:.2e} BATCH_SIZE={c['batch_size']} dropout={c['conv_dropout']}/{c['dense_dropout']}")
+    print(f"\n💾 Results table: {results_path}")
+    return leaderboard
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Successive-halving search over LR, batch size and dropout.")
+    parser.add_argument("--trials", type=int, default=27)
+    parser.add_argument("--min-epochs", type=int, default=1)
+    parser.add_argument("--max-epochs", type=int, default=27)
+    parser.add_argument("--eta", type=int, default=3, help="Keep the top 1/eta trials at each rung")
+    parser.add_argument("--budget-minutes", type=float, default=None,
+                        help="Wall budget; checked between epochs, so the search can overrun it by up to one epoch")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if args.eta < 2:
+        parser.error("--eta must be at least 2")
+    if not 1 <= args.min_epochs <= args.max_epochs:
+        parser.error("need 1 <= --min-epochs <= --max-epochs")
+
+    run_search(args.trials, args.min_epochs, args.max_epochs, args.eta, args.budget_minutes, args.seed)
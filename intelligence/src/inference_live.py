@@ -1,17 +1,34 @@
 import cv2
 import numpy as np
 import tensorflow as tf
+import argparse
 import os
 import time
 
+from adaptive_controller import AdaptiveController, default_log_path
+from emotion_timeline import TimelineWriter
+from face_detection import available_backends, create_detector, expand_box, union_box
+from perf_metrics import PerfMonitor, update_personal_best
+
 # --- CONFIGURATION ---
 MODEL_PATH = os.path.join("intelligence", "models", "spectra_best_model.keras")
 EMOTIONS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Neutral', 'Sad', 'Surprise']
+ROI_MARGIN = 0.5        # Grow last known faces by 50% per side when tracking
+FULL_SCAN_EVERY = 15    # Frames between full-frame scans in ROI tracking mode
 
-def main():
+def main(detector_name="haar", detect_scale=1.0, track_roi=False, adaptive=False, target_fps=30, metrics=True, timeline=False):
     print("🎥 Initializing Spectra Live Inference...")
-    
-    # 1. Load Model
+
+    # 1. Setup Face Detection (first, so a missing model file fails before the camera is taken)
+    detector_kwargs = {"scale_factor": 1.3} if detector_name in ("haar", "lbp") else {}
+    try:
+        detector = create_detector(detector_name, detect_scale=detect_scale, **detector_kwargs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return
+    print(f"👤 Face detector: {detector_name} @ {detect_scale:.2f}x" + (" (ROI tracking)" if track_roi else ""))
+
+    # 2. Load Model
     if not os.path.exists(MODEL_PATH):
         print(f"❌ Error: Model not found at {MODEL_PATH}")
         return
@@ -20,58 +37,90 @@ def main():
     model = tf.keras.models.load_model(MODEL_PATH)
     print("✅ Model loaded successfully!")
 
-    # 2. Setup Webcam
+    # 3. Setup Webcam
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
         print("❌ Error: Could not open webcam.")
         return
 
-    # 3. Setup Face Detection (Standard OpenCV Haar Cascade)
-    face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
-
     print("\n🟢 SPECTRA LIVE | Press 'Q' to quit")
     print("-" * 50)
 
-    # Frame timing for FPS
-    prev_time = 0
+    # 4. Adaptive Controller (dynamic detection resolution + decoupled AI rate)
+    controller = None
+    if adaptive:
+        controller = AdaptiveController(target_fps=target_fps, start_level=0, base_scale=detect_scale,
+                                        log_path=default_log_path())
+        print(f"🎚️  Adaptive mode: {target_fps} FPS budget | decisions -> {controller.log_path}")
+
+    # 5. Telemetry (rolling FPS + per-stage latencies, exported on exit)
+    perf = PerfMonitor("inference_live", enabled=metrics)
+
+    # 6. Emotion Timeline (background writer, never blocks the display loop)
+    timeline_writer = TimelineWriter() if timeline else None
+    if timeline_writer:
+        print(f"🗂️  Recording emotion timeline -> {timeline_writer.store.root}")
+
+    frame_idx = 0
+    last_faces = []
+    results = []  # (x, y, w, h, label, score) from the latest AI step, redrawn every frame
 
     while True:
+        frame_start = time.perf_counter()
         ret, frame = cap.read()
+        capture_ms = (time.perf_counter() - frame_start) * 1000
+        perf.record("capture", capture_ms)
         if not ret:
             print("❌ Error: Failed to capture frame.")
             break
 
         # Mirror the frame (more natural)
         frame = cv2.flip(frame, 1)
-        
-        # Convert to Grayscale (Model expects 1 channel)
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-
-        # Detect Faces
-        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.3, minNeighbors=5, minSize=(30, 30))
-
-        # Process each face
-        for (x, y, w, h) in faces:
-            # ROI (Region of Interest)
-            roi_gray = gray[y:y+h, x:x+w]
-            
-            # Preprocessing (Match training logic!)
-            # 1. Resize to 48x48
-            roi_resized = cv2.resize(roi_gray, (48, 48))
-            
-            # 2. Normalize (0-1)
-            roi_norm = roi_resized.astype('float32') / 255.0
-            
-            # 3. Reshape for Model (Batch=1, H=48, W=48, C=1)
-            roi_input = np.expand_dims(roi_norm, axis=0)
-            roi_input = np.expand_dims(roi_input, axis=-1)
-
-            # Inference
-            prediction = model.predict(roi_input, verbose=0)
-            score = np.max(prediction)
-            label_idx = np.argmax(prediction)
-            label = EMOTIONS[label_idx]
 
+        run_ai = controller.should_run_ai() if controller else True
+        detect_ms = infer_ms = None
+        if run_ai:
+            if controller:
+                detector.detect_scale = controller.detect_scale
+
+            # Convert to Grayscale (Model expects 1 channel)
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+            # Detect Faces (optionally only around where faces were last frame)
+            t0 = time.perf_counter()
+            roi = None
+            if track_roi and last_faces and frame_idx % FULL_SCAN_EVERY != 0:
+                roi = expand_box(union_box(last_faces), ROI_MARGIN, gray.shape)
+            det_input = frame if detector.wants_color else gray
+            faces = detector.detect(det_input, roi=roi)
+            if roi is not None and not faces:
+                faces = detector.detect(det_input)  # Lost the face: fall back to a full scan
+            last_faces = faces
+            frame_idx += 1
+            detect_ms = (time.perf_counter() - t0) * 1000
+            perf.record("detection", detect_ms)
+            perf.count("ai_steps")
+            perf.count("faces", len(faces))
+
+            # Preprocessing (Match training logic!): Resize 48x48 -> Normalize (0-1) -> (N, 48, 48, 1)
+            results = []
+            if len(faces):
+                t0 = time.perf_counter()
+                batch = np.stack([cv2.resize(gray[y:y+h, x:x+w], (48, 48)) for (x, y, w, h) in faces])
+                batch = batch.astype('float32')[..., np.newaxis] / 255.0
+
+                # Inference (all faces in one call)
+                predictions = model.predict(batch, verbose=0)
+                infer_ms = (time.perf_counter() - t0) * 1000
+                perf.record("inference", infer_ms)
+                if timeline_writer:
+                    timeline_writer.append(predictions)
+
+                for (x, y, w, h), prediction in zip(faces, predictions):
+                    results.append((x, y, w, h, EMOTIONS[np.argmax(prediction)], np.max(prediction)))
+
+        # Draw the latest results (display runs every frame, even when the AI step is skipped)
+        for (x, y, w, h, label, score) in results:
             # Visuals
             color = (0, 255, 0) # Green
             if label in ['Angry', 'Disgust', 'Fear', 'Sad']:
@@ -85,13 +134,14 @@ def main():
                         cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
 
             # Terminal Output (Simple logging)
-            print(f"\r>> DETECTED: {label.upper()} [{score:.2f}]   ", end="")
+            if run_ai:
+                print(f"\r>> DETECTED: {label.upper()} [{score:.2f}]   ", end="")
+
+        # Rolling FPS (0 until a second frame arrives, no divide-by-zero; still shown with --no-metrics)
+        cv2.putText(frame, f"FPS: {perf.fps:.0f}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
 
-        # Compute FPS
-        curr_time = time.time()
-        fps = 1 / (curr_time - prev_time)
-        prev_time = curr_time
-        cv2.putText(frame, f"FPS: {int(fps)}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        if controller:
+            cv2.putText(frame, controller.status(), (10, 55), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
 
         # Show Display
         cv2.imshow('Project Spectra: Live Inference', frame)
@@ -100,10 +150,55 @@ def main():
         if cv2.waitKey(1) & 0xFF == ord('q'):
             break
 
+        perf.tick()
+
+        if controller:
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            action = controller.on_frame(frame_ms, detect_ms, infer_ms, capture_ms=capture_ms)
+            if action in ("up", "down"):
+                print(f"\n🎚️  Adaptive {action.upper()}: {controller.status()}")
+
     # Cleanup
+    if controller:
+        controller.close()
+    if timeline_writer:
+        timeline_writer.close()
+        if timeline_writer.dropped:
+            print(f"\n⚠️  Timeline dropped {timeline_writer.dropped} frames (writer queue full or stopped)")
+        if timeline_writer.error:
+            print(f"\n⚠️  Timeline writer stopped: {timeline_writer.error}")
     cap.release()
     cv2.destroyAllWindows()
     print("\n🔴 Session Ended.")
 
+    if perf.enabled:
+        report = perf.report()
+        print(f"📊 Median FPS {report['fps']['session_median']} | " + " | ".join(
+            f"{name} p50 {s['p50_ms']:.1f}ms" for name, s in report["stages"].items() if s["count"]))
+        print(f"💾 Performance report: {perf.export_json()} (+ {perf.export_csv()})")
+        for stage, r in update_personal_best(report).items():
+            print(f"⚠️  Regression: {stage} p50 {r['p50_ms']:.1f}ms vs personal best {r['best_p50_ms']:.1f}ms")
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Spectra live webcam inference.")
+    parser.add_argument("--detector", default="haar", choices=available_backends(),
+                        help="Face detection backend (only those whose model files are installed are offered)")
+    parser.add_argument("--detect-scale", type=float, default=1.0,
+                        help="Run detection on a frame downscaled by this factor (e.g. 0.5)")
+    parser.add_argument("--track-roi", action="store_true",
+                        help="Search only around the last detected faces, with periodic full scans")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Lower detection resolution / AI rate when the frame budget is exceeded")
+    parser.add_argument("--target-fps", type=float, default=30,
+                        help="Frame budget for --adaptive")
+    parser.add_argument("--no-metrics", action="store_true",
+                        help="Disable per-stage telemetry and the session report (the FPS overlay stays)")
+    parser.add_argument("--timeline", action="store_true",
+                        help="Persist per-face probabilities to the emotion timeline store")
+    args = parser.parse_args()
+    if not 0 < args.detect_scale <= 1:
+        parser.error("--detect-scale must be in (0, 1]")
+    if args.target_fps <= 0:
+        parser.error("--target-fps must be positive")
+    main(args.detector, args.detect_scale, args.track_roi, args.adaptive, args.target_fps,
+         not args.no_metrics, args.timeline)
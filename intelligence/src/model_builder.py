@@ -3,10 +3,11 @@
 import tensorflow as tf
 from tensorflow.keras import layers, models
 
-def build_spectra_cnn(num_classes=7):
+def build_spectra_cnn(num_classes=7, conv_dropout=0.25, dense_dropout=0.5):
     """
     Project Spectra CNN: Pure Math Architecture.
     Preprocessing moved to data pipeline to saturate CPU cores.
+    Dropout rates are exposed for hyperparameter search (hparam_search.py).
     """
     print("🏗️  Building AI Stream CNN (Parallel Performance Mode)...")
     
@@ -19,7 +20,7 @@ def build_spectra_cnn(num_classes=7):
         layers.Conv2D(32, (3, 3), padding='same', activation='relu'),
         layers.BatchNormalization(),
         layers.MaxPooling2D(pool_size=(2, 2)),
-        layers.Dropout(0.25),
+        layers.Dropout(conv_dropout),
 
         # LAYER 2: Textures
         layers.Conv2D(64, (3, 3), padding='same', activation='relu'),
@@ -27,7 +28,7 @@ def build_spectra_cnn(num_classes=7):
         layers.Conv2D(64, (3, 3), padding='same', activation='relu'),
         layers.BatchNormalization(),
         layers.MaxPooling2D(pool_size=(2, 2)),
-        layers.Dropout(0.25),
+        layers.Dropout(conv_dropout),
 
         # LAYER 3: Parts
         layers.Conv2D(128, (3, 3), padding='same', activation='relu'),
@@ -35,23 +36,23 @@ def build_spectra_cnn(num_classes=7):
         layers.Conv2D(128, (3, 3), padding='same', activation='relu'),
         layers.BatchNormalization(),
         layers.MaxPooling2D(pool_size=(2, 2)),
-        layers.Dropout(0.25),
+        layers.Dropout(conv_dropout),
 
         # LAYER 4: Final Refinement
         layers.Conv2D(256, (3, 3), padding='same', activation='relu'),
         layers.BatchNormalization(),
         layers.MaxPooling2D(pool_size=(2, 2)),
-        layers.Dropout(0.25),
+        layers.Dropout(conv_dropout),
 
         # DENSE
         layers.Flatten(),
         layers.Dense(512, activation='relu'),
         layers.BatchNormalization(),
-        layers.Dropout(0.5),
+        layers.Dropout(dense_dropout),
         
         layers.Dense(256, activation='relu'),
         layers.BatchNormalization(),
-        layers.Dropout(0.5),
+        layers.Dropout(dense_dropout),
 
         layers.Dense(num_classes, activation='softmax', name='spectra_output')
     ])
@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+# CONFIG
+WEB_MODEL_DIR = os.path.join("platforms", "web", "public", "models")
+KERAS_PATH = os.path.join("intelligence", "models", "spectra_best_model.keras")
+TFLITE_PATH = os.path.join("platforms", "mobile", "assets", "spectra_model.tflite")
+GOLDEN_TENSOR_PATH = os.path.join("shared", "test_assets", "golden_tensor.npy")
+
+EMOTIONS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Neutral', 'Sad', 'Surprise']
+
+
+# --- KERNELS ---
+def conv2d(x, kernel, bias, strides=(1, 1), padding="same"):
+    """NHWC convolution as a single im2col GEMM. `kernel` is Keras layout (kh, kw, cin, cout)."""
+    kh, kw, cin, cout = kernel.shape
+    sh, sw = strides
+    if padding == "same":
+        n, h, w, _ = x.shape
+        out_h, out_w = -(-h // sh), -(-w // sw)
+        pad_h = max((out_h - 1) * sh + kh - h, 0)
+        pad_w = max((out_w - 1) * sw + kw - w, 0)
+        x = np.pad(x, ((0, 0), (pad_h // 2, pad_h - pad_h // 2), (pad_w // 2, pad_w - pad_w // 2), (0, 0)))
+    n, h, w, _ = x.shape
+    out_h, out_w = (h - kh) // sh + 1, (w - kw) // sw + 1
+
+    # Column order (i, j, c) matches the row-major flattening of the Keras kernel
+    cols = np.concatenate([
+        x[:, i:i + sh * (out_h - 1) + 1:sh, j:j + sw * (out_w - 1) + 1:sw, :]
+        for i in range(kh) for j in range(kw)
+    ], axis=-1)
+    out = cols.reshape(-1, kh * kw * cin) @ kernel.reshape(-1, cout)
+    if bias is not None:
+        out += bias
+    return out.reshape(n, out_h, out_w, cout)
+
+
+def max_pool2d(x, pool_size=(2, 2), strides=None, padding="valid"):
+    ph, pw = pool_size
+    strides = strides or pool_size
+    n, h, w, c = x.shape
+    if tuple(strides) == (ph, pw) and padding == "valid":
+        # Non-overlapping windows: a reshape turns pooling into one reduction
+        oh, ow = h // ph, w // pw
+        return x[:, :oh * ph, :ow * pw, :].reshape(n, oh, ph, ow, pw, c).max(axis=(2, 4))
+    windows = np.lib.stride_tricks.sliding_window_view(x, (ph, pw), axis=(1, 2))
+    return windows[:, ::strides[0], ::strides[1]].max(axis=(-2, -1))
+
+
+def softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "tanh": np.tanh,
+    "softmax": softmax,
+}
+
+
+# --- ENGINE ---
+class NumpyEngine:
+    """
+    TensorFlow-free forward pass of the Spectra CNN, driven by the TF.js export.
+    The weight shard is memory-mapped, so startup costs a JSON parse and an mmap.
+    """
+
+    def __init__(self, model_dir=WEB_MODEL_DIR):
+        with open(os.path.join(model_dir, "model.json"), "r") as f:
+            spec = json.load(f)
+
+        self.weights = self._map_weights(model_dir, spec["weightsManifest"])
+        self.layers = self._build_layers(spec["modelTopology"])
+
+    @staticmethod
+    def _map_weights(model_dir, manifest):
+        """Name -> array view into the memory-mapped shard(s)."""
+        weights = {}
+        for group in manifest:
+            if len(group["paths"]) != 1:
+                raise ValueError("NumpyEngine expects one shard per weight group")
+            shard = np.memmap(os.path.join(model_dir, group["paths"][0]), dtype=np.uint8, mode="r")
+            offset = 0
+            for w in group["weights"]:
+                dtype = np.dtype(w["dtype"])
+                count = int(np.prod(w["shape"])) if w["shape"] else 1
+                weights[w["name"]] = shard[offset:offset + count * dtype.itemsize].view(dtype).reshape(w["shape"])
+                offset += count * dtype.itemsize
+        return weights
+
+    def _weight(self, layer_name, key):
+        # Keras 3 exports may prefix the model name ('sequential/conv2d/kernel')
+        for name, value in self.weights.items():
+            if name == f"{layer_name}/{key}" or name.endswith(f"/{layer_name}/{key}"):
+                return value
+        raise KeyError(f"Weight '{layer_name}/{key}' missing from manifest")
+
+    def _build_layers(self, topology):
+        config = topology["config"]
+        layer_specs = config["layers"] if isinstance(config, dict) else config
+
+        layers = []
+        for layer in layer_specs:
+            kind, cfg = layer["class_name"], layer["config"]
+            name = cfg.get("name")
+
+            if kind in ("InputLayer", "Dropout", "SpatialDropout2D", "GaussianNoise"):
+                continue  # No-ops at inference time
+            elif kind == "Conv2D":
+                if tuple(cfg.get("dilation_rate", (1, 1))) != (1, 1) or cfg.get("groups", 1) != 1:
+                    raise NotImplementedError(f"{name}: dilated/grouped convolutions are not supported")
+                kernel = np.ascontiguousarray(self._weight(name, "kernel"))
+                bias = self._weight(name, "bias") if cfg.get("use_bias", True) else None
+                strides, padding, act = tuple(cfg["strides"]), cfg["padding"], ACTIVATIONS[cfg["activation"]]
+                layers.append((name, lambda x, k=kernel, b=bias, s=strides, p=padding, a=act: a(conv2d(x, k, b, s, p))))
+            elif kind == "BatchNormalization":
+                # Inference BN is a per-channel affine: fold it into one scale + shift up front
+                mean = self._weight(name, "moving_mean")
+                var = self._weight(name, "moving_variance")
+                gamma = self._weight(name, "gamma") if cfg.get("scale", True) else 1.0
+                beta = self._weight(name, "beta") if cfg.get("center", True) else 0.0
+                scale = (gamma / np.sqrt(var + cfg.get("epsilon", 1e-3))).astype(np.float32)
+                shift = (beta - mean * scale).astype(np.float32)
+                layers.append((name, lambda x, s=scale, t=shift: x * s + t))
+            elif kind == "MaxPooling2D":
+                pool, strides, padding = tuple(cfg["pool_size"]), cfg.get("strides"), cfg.get("padding", "valid")
+                if padding != "valid":
+                    raise NotImplementedError(f"{name}: only 'valid' pooling is supported")
+                layers.append((name, lambda x, p=pool, s=strides: max_pool2d(x, p, tuple(s) if s else None)))
+            elif kind == "Flatten":
+                layers.append((name, lambda x: x.reshape(len(x), -1)))
+            elif kind == "Dense":
+                kernel = np.ascontiguousarray(self._weight(name, "kernel"))
+                bias = self._weight(name, "bias") if cfg.get("use_bias", True) else 0.0
+                act = ACTIVATIONS[cfg["activation"]]
+                layers.append((name, lambda x, k=kernel, b=bias, a=act: a(x @ k + b)))
+            else:
+                raise NotImplementedError(f"Layer type '{kind}' is not supported by NumpyEngine")
+        return layers
+
+    def predict(self, X, batch_size=16):
+        """X: (N, 48, 48, 1) or (N, 48, 48) float32 in [0, 1]. Returns (N, 7) probabilities."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 3:
+            X = X[..., None]
+
+        # im2col expands activations 9x, so batches stay small enough to live in cache/RAM
+        outputs = []
+        for i in range(0, len(X), batch_size):
+            x = X[i:i + batch_size]
+            for _, fn in self.layers:
+                x = fn(x)
+            outputs.append(x)
+        return np.concatenate(outputs)
+
+
+# --- VERIFICATION & BENCHMARK ---
+def verify_against_keras(engine):
+    import tensorflow as tf
+
+    print("🔍 Verifying exported weights against Keras on the golden tensor...")
+    golden = np.load(GOLDEN_TENSOR_PATH).reshape(1, 48, 48, 1).astype(np.float32)
+    rng = np.random.default_rng(42)
+    batch = np.concatenate([golden, np.zeros_like(golden), rng.random((30, 48, 48, 1), dtype=np.float32)])
+
+    keras_out = tf.keras.models.load_model(KERAS_PATH).predict(batch, verbose=0)
+    numpy_out = engine.predict(batch)
+    drift = np.abs(keras_out - numpy_out).max()
+    agree = (keras_out.argmax(axis=1) == numpy_out.argmax(axis=1)).mean()
+
+    print(f"  Golden -> Keras: {EMOTIONS[keras_out[0].argmax()]} | NumPy: {EMOTIONS[numpy_out[0].argmax()]}")
+    print(f"  Max drift: {drift:.2e} | Top-1 agreement: {agree:.0%}")
+    print("✅ Weights match." if drift < 1e-4 else "❌ Exported weights DIVERGE from Keras!")
+    return drift
+
+
+def benchmark(engine, n=512, batch_size=16):
+    import tensorflow as tf
+
+    X = np.random.default_rng(0).random((n, 48, 48, 1), dtype=np.float32)
+
+    engine.predict(X[:batch_size], batch_size)  # Warm-up
+    start = time.perf_counter()
+    numpy_out = engine.predict(X, batch_size)
+    numpy_sec = time.perf_counter() - start
+
+    interpreter = tf.lite.Interpreter(model_path=TFLITE_PATH, num_threads=os.cpu_count())
+    inp = interpreter.get_input_details()[0]
+    out = interpreter.get_output_details()[0]
+    interpreter.resize_tensor_input(inp["index"], [batch_size, 48, 48, 1])
+    interpreter.allocate_tensors()
+
+    allocated = batch_size
+    tflite_out = []
+    start = time.perf_counter()
+    for i in range(0, n, batch_size):
+        chunk = X[i:i + batch_size]
+        if allocated != len(chunk):
+            # The last chunk is short when n isn't a multiple of batch_size
+            interpreter.resize_tensor_input(inp["index"], [len(chunk), 48, 48, 1])
+            interpreter.allocate_tensors()
+            allocated = len(chunk)
+        interpreter.set_tensor(inp["index"], chunk)
+        interpreter.invoke()
+        tflite_out.append(interpreter.get_tensor(out["index"]).copy())
+    tflite_sec = time.perf_counter() - start
+    tflite_out = np.concatenate(tflite_out)
+
+    print(f"\n⏱️  BENCHMARK ({n} images, batch {batch_size})")
+    print("-" * 50)
+    print(f"  NumPy engine : {numpy_sec * 1000 / n:.3f} ms/img ({n / numpy_sec:.0f} img/s)")
+    print(f"  TFLite       : {tflite_sec * 1000 / n:.3f} ms/img ({n / tflite_sec:.0f} img/s)")
+    print(f"  Max drift vs TFLite: {np.abs(numpy_out - tflite_out).max():.2e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the TF.js export with pure NumPy.")
+    parser.add_argument("--model-dir", default=WEB_MODEL_DIR)
+    parser.add_argument("--verify", action="store_true", help="Compare against the Keras model on the golden assets")
+    parser.add_argument("--benchmark", action="store_true", help="Compare throughput against TFLite")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    engine = NumpyEngine(args.model_dir)
+    print(f"🧮 NumPy engine ready in {(time.perf_counter() - start) * 1000:.1f} ms ({len(engine.layers)} ops)")
+
+    golden = np.load(GOLDEN_TENSOR_PATH)
+    probs = engine.predict(golden[None])[0]
+    print(f"🌟 Golden tensor -> {EMOTIONS[probs.argmax()]} ({probs.max():.2%})")
+
+    if args.verify:
+        verify_against_keras(engine)
+    if args.benchmark:
+        benchmark(engine, batch_size=args.batch_size)
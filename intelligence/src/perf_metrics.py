@@ -0,0 +1,349 @@
+import csv
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+# --- CONFIGURATION ---
+LOGS_DIR = os.path.join("intelligence", "logs")
+PERSONAL_BEST_PATH = os.path.join(LOGS_DIR, "personal_best.json")
+WINDOW = 60                     # Rolling window, matches usePerformanceMonitor's 60 frames
+QUANTILES = (0.5, 0.95, 0.99)   # Session-wide streaming estimates
+REGRESSION_TOLERANCE = 1.15     # Median >15% above personal best counts as a regression
+FPS_SMOOTHING = 0.1             # EMA weight for the FPS readout when telemetry is disabled
+
+
+class RingBuffer:
+    """Fixed-size float ring over a preallocated array: O(1) push, no allocation after init."""
+
+    def __init__(self, size=WINDOW):
+        self._data = np.zeros(size, dtype=np.float64)
+        self._size = size
+        self._idx = 0
+        self._count = 0
+
+    def push(self, value):
+        self._data[self._idx] = value
+        self._idx = (self._idx + 1) % self._size
+        if self._count < self._size:
+            self._count += 1
+
+    def values(self):
+        """Samples oldest -> newest."""
+        if self._count < self._size:
+            return self._data[:self._count].copy()
+        return np.roll(self._data, -self._idx)
+
+    def mean(self):
+        return float(self._data[:self._count].mean()) if self._count else 0.0
+
+    def percentile(self, q):
+        return float(np.percentile(self._data[:self._count], q)) if self._count else 0.0
+
+    def last(self):
+        return float(self._data[self._idx - 1]) if self._count else 0.0
+
+    def clear(self):
+        self._idx = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+
+class P2Quantile:
+    """
+    Streaming quantile estimate in O(1) memory (Jain & Chlamtac P-square algorithm).
+    Session-long p50/p95 without keeping every sample.
+    """
+
+    def __init__(self, p):
+        self.p = p
+        self.n = 0
+        self._q = []
+        self._pos = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self._desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self._inc = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x):
+        self.n += 1
+        q = self._q
+        if self.n <= 5:
+            q.append(x)
+            if self.n == 5:
+                q.sort()
+            return
+
+        pos = self._pos
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        for i in range(5):
+            self._desired[i] += self._inc[i]
+
+        # Nudge the three middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                d = 1 if d > 0 else -1
+                qp = q[i] + d / (pos[i + 1] - pos[i - 1]) * (
+                    (pos[i] - pos[i - 1] + d) * (q[i + 1] - q[i]) / (pos[i + 1] - pos[i]) +
+                    (pos[i + 1] - pos[i] - d) * (q[i] - q[i - 1]) / (pos[i] - pos[i - 1])
+                )
+                if not q[i - 1] < qp < q[i + 1]:
+                    qp = q[i] + d * (q[i + d] - q[i]) / (pos[i + d] - pos[i])
+                q[i] = qp
+                pos[i] += d
+
+    def value(self):
+        if self.n == 0:
+            return 0.0
+        if self.n < 5:
+            return float(np.percentile(self._q, self.p * 100))
+        return float(self._q[2])
+
+
+class StageStats:
+    """Rolling window + session aggregates for one pipeline stage (milliseconds)."""
+
+    def __init__(self, window=WINDOW):
+        self.window = RingBuffer(window)
+        self.quantiles = {p: P2Quantile(p) for p in QUANTILES}
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, ms):
+        self.window.push(ms)
+        for est in self.quantiles.values():
+            est.add(ms)
+        self.count += 1
+        self.total += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        out = {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3),
+            "min_ms": round(self.min, 3),
+            "max_ms": round(self.max, 3),
+            "rolling_mean_ms": round(self.window.mean(), 3),
+        }
+        for p, est in self.quantiles.items():
+            out[f"p{int(p * 100)}_ms"] = round(est.value(), 3)
+        return out
+
+
+class _StageTimer:
+    __slots__ = ("_monitor", "_name", "_start")
+
+    def __init__(self, monitor, name):
+        self._monitor = monitor
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._monitor.record(self._name, (time.perf_counter() - self._start) * 1000)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class PerfMonitor:
+    """
+    Python counterpart of the web `usePerformanceMonitor` hook.
+
+    Usage:
+        perf = PerfMonitor("inference_live")
+        with perf.stage("detection"): ...
+        perf.count("faces", len(faces))
+        perf.tick()                     # once per displayed frame
+        perf.fps                        # rolling FPS (0 until two frames have been seen)
+        perf.export_json() / perf.export_csv()
+
+    With enabled=False every call returns immediately, so instrumentation can stay in hot loops.
+    Only tick() still does work: an EMA of the frame interval, so `fps` stays usable for an overlay.
+    """
+
+    def __init__(self, session="spectra", enabled=True, window=WINDOW):
+        self.session = session
+        self.enabled = enabled
+        self.window = window
+        self.stages = {}
+        self.counters = {}
+        self.frame_ms = StageStats(window)
+        self.started_at = time.time()
+        self._last_tick = None
+        self._ema_ms = 0.0
+
+    # --- RECORDING ---
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        stats = self.stages.get(name)
+        if stats is None:
+            stats = self.stages[name] = StageStats(self.window)
+        stats.add(ms)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def tick(self):
+        """Marks the end of a displayed frame. The first tick only starts the clock."""
+        now = time.perf_counter()
+        if not self.enabled:
+            if self._last_tick is not None:
+                ms = (now - self._last_tick) * 1000
+                self._ema_ms = ms if not self._ema_ms else self._ema_ms + FPS_SMOOTHING * (ms - self._ema_ms)
+            self._last_tick = now
+            return
+        if self._last_tick is not None:
+            self.frame_ms.add((now - self._last_tick) * 1000)
+        self._last_tick = now
+        self.counters["frames"] = self.counters.get("frames", 0) + 1
+
+    # --- READING ---
+    @property
+    def fps(self):
+        mean = self.frame_ms.window.mean() if self.enabled else self._ema_ms
+        return 1000.0 / mean if mean > 0 else 0.0
+
+    def rolling(self, name):
+        stats = self.stages.get(name)
+        return stats.window.mean() if stats else 0.0
+
+    # --- REPORTING (performance_plan 6.1) ---
+    def report(self):
+        duration = time.time() - self.started_at
+        frame = self.frame_ms.summary()
+        return {
+            "session": self.session,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "duration_sec": round(duration, 2),
+            "hardware": hardware_info(),
+            "fps": {
+                "rolling": round(self.fps, 1),
+                "session_mean": round(1000.0 / frame["mean_ms"], 1) if frame.get("mean_ms") else 0.0,
+                "session_median": round(1000.0 / frame["p50_ms"], 1) if frame.get("p50_ms") else 0.0,
+            },
+            "frame": frame,
+            "stages": {name: stats.summary() for name, stats in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+    def export_json(self, path=None):
+        path = path or self._default_path("json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def export_csv(self, path=None):
+        """One row per stage (plus 'frame'), with the hardware fingerprint flattened into every row."""
+        path = path or self._default_path("csv")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        report = self.report()
+        hw = {f"hw_{k}": v for k, v in report["hardware"].items()}
+        rows = [{"stage": "frame", **report["frame"]}]
+        rows += [{"stage": name, **summary} for name, summary in report["stages"].items()]
+
+        fields = ["session", "duration_sec", "stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms",
+                  "min_ms", "max_ms", "rolling_mean_ms"] + list(hw)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({"session": self.session, "duration_sec": report["duration_sec"], **row, **hw})
+        return path
+
+    def _default_path(self, ext):
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at))
+        return os.path.join(LOGS_DIR, f"perf_{self.session}_{stamp}.{ext}")
+
+
+def hardware_info():
+    """Best-effort fingerprint (performance_plan 3.3). Never imports heavy frameworks itself."""
+    info = {
+        "os": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or "unknown",
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+    for module, key in (("tensorflow", "tensorflow"), ("cv2", "opencv")):
+        if module in sys.modules:
+            info[key] = getattr(sys.modules[module], "__version__", "unknown")
+    try:
+        import psutil
+        info["ram_gb"] = round(psutil.virtual_memory().total / 1e9, 1)
+    except ImportError:
+        pass
+    return info
+
+
+def update_personal_best(report, path=PERSONAL_BEST_PATH, tolerance=REGRESSION_TOLERANCE):
+    """
+    performance_plan 6.2: keeps the lowest median latency per session+stage on disk and
+    returns the stages whose median regressed beyond `tolerance` x personal best.
+    """
+    best = {}
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            best = json.load(f)
+
+    session_best = best.setdefault(report["session"], {})
+    regressions = {}
+    for stage, summary in report["stages"].items():
+        median = summary.get("p50_ms")
+        if median is None:
+            continue
+        prev = session_best.get(stage)
+        if prev is not None and median > prev["p50_ms"] * tolerance:
+            regressions[stage] = {"p50_ms": median, "best_p50_ms": prev["p50_ms"]}
+        if prev is None or median < prev["p50_ms"]:
+            session_best[stage] = {"p50_ms": median, "at": report["started_at"]}
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(best, f, indent=2)
+    return regressions
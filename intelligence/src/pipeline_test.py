@@ -4,6 +4,9 @@ import tensorflow as tf
 import time
 import os
 
+from face_detection import create_detector
+from perf_metrics import PerfMonitor
+
 # CONFIGURATION
 MODEL_PATH = os.path.join("intelligence", "models", "spectra_dummy_model.tflite")
 LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
@@ -23,6 +26,11 @@ def run_pipeline_test():
         print(f"❌ Failed to load model: {e}")
         return
 
+    # Face detection on a half-res frame is plenty for a 2s tracker
+    detector = create_detector("haar", detect_scale=0.5)
+
+    perf = PerfMonitor("pipeline_test")
+
     # 2. Access Webcam
     cap = cv2.VideoCapture(0)
     if not cap.isOpened():
@@ -43,13 +51,19 @@ def run_pipeline_test():
             # Step A: Convert to Grayscale
             gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             
-            # Step B: Center Crop & Resize to 48x48
-            # (In production, this is done after face detection)
-            h, w = gray.shape
-            size = min(h, w)
-            start_h = (h - size) // 2
-            start_w = (w - size) // 2
-            cropped = gray[start_h:start_h+size, start_w:start_w+size]
+            # Step B: Crop the largest face (Center Crop if none) & Resize to 48x48
+            with perf.stage("detection"):
+                faces = detector.detect(gray)
+            perf.count("faces_found" if faces else "center_crops")
+            if faces:
+                x, y, fw, fh = max(faces, key=lambda f: f[2] * f[3])
+                cropped = gray[y:y+fh, x:x+fw]
+            else:
+                h, w = gray.shape
+                size = min(h, w)
+                start_h = (h - size) // 2
+                start_w = (w - size) // 2
+                cropped = gray[start_h:start_h+size, start_w:start_w+size]
             resized = cv2.resize(cropped, (48, 48))
             
             # Step C: Normalize (0 to 1.0)
@@ -59,9 +73,11 @@ def run_pipeline_test():
             input_tensor = np.expand_dims(np.expand_dims(normalized, axis=0), axis=-1)
 
             # --- INFERENCE ---
-            interpreter.set_tensor(input_details[0]['index'], input_tensor)
-            interpreter.invoke()
-            predictions = interpreter.get_tensor(output_details[0]['index'])[0]
+            with perf.stage("inference"):
+                interpreter.set_tensor(input_details[0]['index'], input_tensor)
+                interpreter.invoke()
+                predictions = interpreter.get_tensor(output_details[0]['index'])[0]
+            perf.tick()
             
             # Get max prediction
             top_index = np.argmax(predictions)
@@ -80,6 +96,8 @@ def run_pipeline_test():
     finally:
         cap.release()
         cv2.destroyAllWindows()
+        if perf.counters.get("frames"):
+            print(f"📊 Performance report: {perf.export_json()}")
 
 if __name__ == "__main__":
     run_pipeline_test()
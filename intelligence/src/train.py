@@ -1,6 +1,8 @@
 import tensorflow as tf
 from data_loader import get_data_generators
 from model_builder import build_spectra_cnn
+from training_monitor import ThroughputMonitor
+import argparse
 import os
 
 # PERFORMANCE CONFIG
@@ -11,13 +13,8 @@ LR = 0.0005      # Lowering LR for fine-tuning during resume
 MODELS_DIR = os.path.join("intelligence", "models")
 os.makedirs(MODELS_DIR, exist_ok=True)
 
-def train_spectra_model():
-    print("🔥 Starting Parallel CPU-Saturating Training...")
-
-    # 1. Load Data into RAM
-    (X_train, y_train), (X_val, y_val), (X_test, y_test) = get_data_generators()
-
-    # 2. Parallel Augmentation Pipeline
+def build_train_dataset(X_train, y_train, batch_size):
+    """Efficient tf.data pipeline: shuffle -> batch -> parallel augmentation -> prefetch."""
     augment_layer = tf.keras.Sequential([
         tf.keras.layers.RandomFlip("horizontal"),
         tf.keras.layers.RandomRotation(0.1),
@@ -27,11 +24,24 @@ def train_spectra_model():
     def augment_fn(x, y):
         return augment_layer(x, training=True), y
 
-    # Efficient tf.data Pipeline
     train_ds = tf.data.Dataset.from_tensor_slices((X_train, y_train))
-    train_ds = train_ds.shuffle(len(X_train)).batch(BATCH_SIZE)
+    train_ds = train_ds.shuffle(len(X_train)).batch(batch_size)
     train_ds = train_ds.map(augment_fn, num_parallel_calls=tf.data.AUTOTUNE)
-    train_ds = train_ds.prefetch(buffer_size=tf.data.AUTOTUNE)
+    return train_ds.prefetch(buffer_size=tf.data.AUTOTUNE)
+
+def train_spectra_model(instrument=False, profile_steps=None):
+    print("🔥 Starting Parallel CPU-Saturating Training...")
+
+    # 1. Load Data into RAM
+    (X_train, y_train), (X_val, y_val), (X_test, y_test) = get_data_generators()
+
+    # 2. Parallel Augmentation Pipeline
+    train_ds = build_train_dataset(X_train, y_train, BATCH_SIZE)
+
+    monitor = None
+    if instrument:
+        monitor = ThroughputMonitor(batch_size=BATCH_SIZE, profile_steps=profile_steps)
+        train_ds = monitor.instrument(train_ds)
 
     val_ds = tf.data.Dataset.from_tensor_slices((X_val, y_val)).batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
     test_ds = tf.data.Dataset.from_tensor_slices((X_test, y_test)).batch(BATCH_SIZE).prefetch(tf.data.AUTOTUNE)
@@ -63,6 +73,8 @@ def train_spectra_model():
         tf.keras.callbacks.EarlyStopping(monitor='val_loss', patience=10, restore_best_weights=True),
         tf.keras.callbacks.ReduceLROnPlateau(monitor='val_loss', factor=0.2, patience=5)
     ]
+    if monitor:
+        callbacks.append(monitor)
 
     # 5. EXECUTION
     print(f"📈 Parallel Dispatch Initialized. Saturing i7 cores...")
@@ -78,5 +90,23 @@ def train_spectra_model():
     model.evaluate(test_ds)
     model.save(os.path.join(MODELS_DIR, "spectra_final_model.keras"))
 
+def step_window(value):
+    """argparse type for --profile-steps: 'FIRST,LAST' with 0 <= FIRST <= LAST."""
+    parts = value.split(",")
+    try:
+        first, last = (int(p) for p in parts)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected FIRST,LAST (two integers), got '{value}'")
+    if not 0 <= first <= last:
+        raise argparse.ArgumentTypeError(f"need 0 <= FIRST <= LAST, got {first},{last}")
+    return first, last
+
 if __name__ == "__main__":
-    train_spectra_model()
+    parser = argparse.ArgumentParser(description="Train the Spectra CNN.")
+    parser.add_argument("--instrument", action="store_true",
+                        help="Log per-step input-wait vs compute, samples/sec, CPU and memory to intelligence/logs")
+    parser.add_argument("--profile-steps", type=step_window, default=None, metavar="FIRST,LAST",
+                        help="Capture a TensorFlow profiler trace for this global step window (implies --instrument)")
+    args = parser.parse_args()
+
+    train_spectra_model(instrument=args.instrument or args.profile_steps is not None, profile_steps=args.profile_steps)
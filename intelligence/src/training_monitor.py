@@ -0,0 +1,194 @@
+import csv
+import json
+import os
+import time
+
+import numpy as np
+import psutil
+import tensorflow as tf
+
+# INSTRUMENTATION CONFIG
+LOGS_DIR = os.path.join("intelligence", "logs")
+
+
+class ThroughputMonitor(tf.keras.callbacks.Callback):
+    """
+    Spectra Throughput Monitor: splits every training step into input-wait vs compute.
+
+    Input wait is measured in-graph: `instrument()` appends a stamp after the
+    prefetch buffer, so the stamp fires the moment `model.fit` actually receives
+    a batch. Everything before it (since batch begin) is time spent waiting on
+    the augmentation pipeline, everything after it is the model step.
+    """
+
+    def __init__(self, batch_size, log_dir=LOGS_DIR, profile_steps=None):
+        super().__init__()
+        self.batch_size = batch_size
+        self.log_dir = log_dir
+        self.profile_steps = profile_steps  # (first, last) global step, inclusive
+        self.run_id = time.strftime("%Y%m%d-%H%M%S")
+
+        # Written by the dataset, read by the callback
+        self._ready_at = tf.Variable(0.0, dtype=tf.float64, trainable=False)
+        self._instrumented = False
+
+        self._process = psutil.Process(os.getpid())
+        self._global_step = 0
+        self._profiling = False
+        self._in_epoch = False
+        self.epochs = []
+
+    # --- DATASET HOOK ---
+    def instrument(self, dataset):
+        """Returns `dataset` with a ready-stamp appended after its last prefetch."""
+        ready_at = self._ready_at
+
+        def stamp(*batch):
+            ready_at.assign(tf.timestamp())
+            return batch if len(batch) > 1 else batch[0]
+
+        self._instrumented = True
+        return dataset.map(stamp)
+
+    # --- KERAS HOOKS ---
+    def on_train_begin(self, logs=None):
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._steps_path = os.path.join(self.log_dir, f"steps_{self.run_id}.csv")
+        with open(self._steps_path, "w", newline="") as f:
+            csv.writer(f).writerow(["epoch", "step", "input_wait_ms", "compute_ms", "samples_per_sec"])
+
+        if not self._instrumented:
+            print("⚠️  Monitor: dataset not instrumented, input wait will read as 0.")
+        self._train_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch = epoch
+        self._rows = []
+        self._wait = []
+        self._compute = []
+        self._epoch_start = time.perf_counter()
+        self._train_end = None
+        self._train_cpu = None
+        self._in_epoch = True
+        self._process.cpu_percent(None)  # Reset the CPU sampling window
+        self._cpu_times = self._process.cpu_times()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.profile_steps and self._global_step == self.profile_steps[0]:
+            print(f"\n🔬 Profiler: capturing steps {self.profile_steps[0]}-{self.profile_steps[1]}...")
+            tf.profiler.experimental.start(os.path.join(self.log_dir, f"profile_{self.run_id}"))
+            self._profiling = True
+        self._batch_start = time.time()
+
+    def on_train_batch_end(self, batch, logs=None):
+        end = time.time()
+        total = end - self._batch_start
+
+        if self._instrumented:
+            # Clamp: the stamp can't precede batch begin, but clocks can jitter by a few µs
+            wait = min(max(float(self._ready_at.numpy()) - self._batch_start, 0.0), total)
+        else:
+            wait = 0.0
+        compute = total - wait
+
+        self._wait.append(wait)
+        self._compute.append(compute)
+        self._rows.append([
+            self._epoch, batch,
+            round(wait * 1000, 3), round(compute * 1000, 3),
+            round(self.batch_size / total, 1) if total > 0 else 0.0
+        ])
+
+        if self._profiling and self._global_step >= self.profile_steps[1]:
+            tf.profiler.experimental.stop()
+            self._profiling = False
+            print(f"\n🔬 Profiler trace saved to {os.path.join(self.log_dir, f'profile_{self.run_id}')}")
+        self._global_step += 1
+        self._train_end = time.perf_counter()
+
+    def on_test_begin(self, logs=None):
+        # Validation inside fit(): close the training window so throughput excludes it
+        if self._in_epoch and self._train_cpu is None:
+            self._train_end = time.perf_counter()
+            self._train_cpu = (self._process.cpu_times(), self._process.cpu_percent(None))
+
+    def on_epoch_end(self, epoch, logs=None):
+        self._in_epoch = False
+        now = time.perf_counter()
+        train_end = self._train_end or now
+        train_sec = train_end - self._epoch_start  # Up to the last training step, validation excluded
+        wait = np.array(self._wait)
+        compute = np.array(self._compute)
+        steps = len(wait)
+
+        if self._train_cpu is not None:
+            cpu_then, cpu_pct = self._train_cpu
+        else:
+            cpu_then, cpu_pct = self._process.cpu_times(), self._process.cpu_percent(None)
+        cpu_seconds = (cpu_then.user - self._cpu_times.user) + (cpu_then.system - self._cpu_times.system)
+
+        record = {
+            "epoch": epoch,
+            "steps": steps,
+            "epoch_sec": round(now - self._epoch_start, 2),
+            "train_sec": round(train_sec, 2),
+            "val_sec": round(now - train_end, 2),
+            "samples_per_sec": round(steps * self.batch_size / train_sec, 1) if train_sec > 0 else 0.0,
+            "input_wait_ms_mean": round(float(wait.mean()) * 1000, 3) if steps else 0.0,
+            "input_wait_ms_p95": round(float(np.percentile(wait, 95)) * 1000, 3) if steps else 0.0,
+            "compute_ms_mean": round(float(compute.mean()) * 1000, 3) if steps else 0.0,
+            "compute_ms_p95": round(float(np.percentile(compute, 95)) * 1000, 3) if steps else 0.0,
+            "input_bound_pct": round(100 * float(wait.sum()) / max(float(wait.sum() + compute.sum()), 1e-9), 1),
+            "cpu_pct": round(cpu_pct, 1),
+            "cpu_cores_busy": round(cpu_seconds / train_sec, 2) if train_sec > 0 else 0.0,
+            "rss_mb": round(self._process.memory_info().rss / 1e6, 1),
+        }
+        for k, v in (logs or {}).items():
+            record[k] = round(float(v), 5)
+        self.epochs.append(record)
+
+        with open(self._steps_path, "a", newline="") as f:
+            csv.writer(f).writerows(self._rows)
+        self._write_epochs()
+
+    def on_train_end(self, logs=None):
+        if self._profiling:
+            tf.profiler.experimental.stop()
+            self._profiling = False
+        self._write_epochs()
+        self.print_summary()
+
+    # --- REPORTING ---
+    def _write_epochs(self):
+        path = os.path.join(self.log_dir, f"epochs_{self.run_id}.json")
+        with open(path, "w") as f:
+            json.dump({
+                "run_id": self.run_id,
+                "batch_size": self.batch_size,
+                "instrumented": self._instrumented,
+                "profile_steps": list(self.profile_steps) if self.profile_steps else None,
+                "epochs": self.epochs
+            }, f, indent=2)
+
+    def print_summary(self):
+        if not self.epochs:
+            return
+        total_wait = sum(e["input_wait_ms_mean"] * e["steps"] for e in self.epochs) / 1000
+        total_compute = sum(e["compute_ms_mean"] * e["steps"] for e in self.epochs) / 1000
+        busy = max(total_wait + total_compute, 1e-9)
+        total_val = sum(e["val_sec"] for e in self.epochs)
+        wall = time.perf_counter() - self._train_start
+
+        print("\n📊 THROUGHPUT SUMMARY")
+        print("-" * 50)
+        print(f"  Epochs             : {len(self.epochs)} ({wall:.1f}s wall)")
+        print(f"  Input wait         : {total_wait:.1f}s ({100 * total_wait / busy:.1f}%)")
+        print(f"  Model compute      : {total_compute:.1f}s ({100 * total_compute / busy:.1f}%)")
+        print(f"  Validation         : {total_val:.1f}s")
+        print(f"  Other (hooks/setup): {max(wall - busy - total_val, 0.0):.1f}s")
+        print(f"  Mean samples/sec   : {np.mean([e['samples_per_sec'] for e in self.epochs]):.1f}")
+        print(f"  Mean CPU cores busy: {np.mean([e['cpu_cores_busy'] for e in self.epochs]):.2f} / {psutil.cpu_count()}")
+        print(f"  Peak RSS           : {max(e['rss_mb'] for e in self.epochs):.1f} MB")
+        verdict = "INPUT-BOUND (augmentation pipeline)" if total_wait > total_compute else "COMPUTE-BOUND (model step)"
+        print(f"  Verdict            : {verdict}")
+        print(f"  Logs               : {self.log_dir}")
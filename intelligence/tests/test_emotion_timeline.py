@@ -0,0 +1,135 @@
+import json
+import time
+
+import numpy as np
+
+from emotion_timeline import TimelineStore, TimelineWriter
+
+T0 = 1_700_000_000.0  # Minute-aligned epoch
+
+
+def synthetic_rows(n=3000, seed=0):
+    """~2 rows/sec over 25 minutes, each minute biased towards one emotion."""
+    rng = np.random.default_rng(seed)
+    ts = T0 + np.sort(rng.uniform(0, 1500, n))
+    probs = rng.dirichlet(np.ones(7), n).astype(np.float32)
+    bias = ((ts - T0) // 60).astype(int) % 7
+    probs[np.arange(n), bias] += 2.0
+    return ts, probs / probs.sum(axis=1, keepdims=True)
+
+
+def brute_force(ts, probs, start, end, bucket_sec, method="mean"):
+    mask = (ts >= start) & (ts < end)
+    buckets = np.floor(ts[mask] / bucket_sec).astype(np.int64)
+    out = {}
+    for b in np.unique(buckets):
+        rows = probs[mask][buckets == b]
+        if method == "mean":
+            out[b * bucket_sec] = rows.mean(axis=0).argmax()
+        else:
+            out[b * bucket_sec] = np.bincount(rows.argmax(axis=1), minlength=7).argmax()
+    return out
+
+
+def test_rollup_queries_match_raw_scan(tmp_path):
+    ts, probs = synthetic_rows()
+    store = TimelineStore(str(tmp_path), chunk_rows=256)
+    for i in range(0, len(ts), 100):
+        store.append(ts[i:i + 100], probs[i:i + 100])
+    store.flush()
+    assert len(store) == len(ts)
+    assert len(store.index["chunks"]) == len(ts) // 256
+
+    # Ragged, non-minute-aligned window across sealed chunks and the active one
+    start, end = T0 + 95.5, T0 + 1433.2
+    for bucket_sec, method in ((60, "mean"), (300, "mean"), (45, "mean"), (60, "vote"), (300, "vote")):
+        buckets, dominant, counts = store.dominant_per_bucket(start, end, bucket_sec=bucket_sec, method=method)
+        expected = brute_force(ts, probs, start, end, bucket_sec, method)
+        assert dict(zip(buckets.tolist(), dominant.tolist())) == {float(k): v for k, v in expected.items()}
+        assert counts.sum() == ((ts >= start) & (ts < end)).sum()
+
+
+def test_uint8_storage_and_reopen(tmp_path):
+    ts, probs = synthetic_rows(500)
+    store = TimelineStore(str(tmp_path), chunk_rows=128)
+    store.append(ts, probs)
+    store.close()
+
+    reader = TimelineStore(str(tmp_path), readonly=True)
+    r_ts, r_probs, _ = reader.read(T0, T0 + 10_000)
+    assert np.array_equal(r_ts, ts)
+    assert np.abs(r_probs - probs).max() <= 0.5 / 255 + 1e-6
+
+    mean, votes, rows = reader.distribution()
+    assert rows == 500 and votes.sum() == 500
+    assert np.allclose(mean, probs.mean(axis=0), atol=1e-3)
+
+
+def test_writer_does_not_lose_rows(tmp_path):
+    writer = TimelineWriter(TimelineStore(str(tmp_path), chunk_rows=64), flush_sec=0.05)
+    for i in range(200):
+        writer.append(np.full((2, 7), 1 / 7), timestamp=T0 + i)
+    writer.close()
+
+    assert writer.dropped == 0
+    assert len(TimelineStore(str(tmp_path), readonly=True)) == 400
+
+
+def test_reopen_discards_uncommitted_seal(tmp_path):
+    ts, probs = synthetic_rows(512)
+    store = TimelineStore(str(tmp_path), chunk_rows=256)
+    store.append(ts, probs)
+    store.close()
+    committed = {name: (tmp_path / f"rollup_{name}.bin").read_bytes() for name in ("minute", "count", "prob_sum", "votes")}
+
+    # Crash mid-seal: rollup rows appended, index never replaced, active.json left behind
+    for name, data in committed.items():
+        with open(tmp_path / f"rollup_{name}.bin", "ab") as f:
+            f.write(data)
+    (tmp_path / "active.json").write_text(json.dumps({"id": 1, "rows": 256}))
+
+    store = TimelineStore(str(tmp_path))
+    for name, data in committed.items():
+        assert (tmp_path / f"rollup_{name}.bin").read_bytes() == data
+    assert not (tmp_path / "active.json").exists()
+
+    _, _, counts = store.dominant_per_bucket(T0, T0 + 10_000)
+    assert counts.sum() == len(store) == 512
+
+
+class FailingStore(TimelineStore):
+    def append(self, *args, **kwargs):
+        raise OSError("disk full")
+
+
+def test_writer_survives_store_errors(tmp_path):
+    writer = TimelineWriter(FailingStore(str(tmp_path)), max_queue=4, flush_sec=0.05)
+    writer.append(np.full((1, 7), 1 / 7), timestamp=T0)
+    deadline = time.monotonic() + 5
+    while writer.error is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    for i in range(10):
+        writer.append(np.full((1, 7), 1 / 7), timestamp=T0 + i)
+    writer.close()  # Used to block forever on a full queue once the thread had died
+
+    assert isinstance(writer.error, OSError)
+    assert writer.dropped == 10
+
+
+def test_queries_only_open_overlapping_chunks(tmp_path):
+    ts, probs = synthetic_rows(3000)
+    store = TimelineStore(str(tmp_path), chunk_rows=100)
+    store.append(ts, probs)
+    store.close()
+
+    reader = TimelineStore(str(tmp_path), readonly=True)
+    start, end = ts[1234], ts[1290]
+    r_ts, _, _ = reader.read(start, end)
+    assert np.array_equal(r_ts, ts[(ts >= start) & (ts < end)])
+    assert set(reader._chunk_cache) <= {11, 12}
+
+    # Whole chunks come from the index summaries; only the two edge chunks are opened
+    reader = TimelineStore(str(tmp_path), readonly=True)
+    mean, votes, rows = reader.distribution(ts[250], ts[2750])
+    assert rows == 2500
+    assert set(reader._chunk_cache) == {2, 27}
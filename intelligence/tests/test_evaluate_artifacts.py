@@ -0,0 +1,48 @@
+import numpy as np
+
+from evaluate_artifacts import confusion_matrix, score_artifact
+
+# Six samples, four of them correct:
+#   truth: angry angry disgust happy happy happy
+#   pred : angry disgust disgust happy happy angry
+Y_TRUE = np.array([0, 0, 1, 3, 3, 3])
+Y_PRED = np.array([0, 1, 1, 3, 3, 0])
+
+
+def one_hot(labels, num_classes=7):
+    return np.eye(num_classes, dtype=np.float32)[labels]
+
+
+def test_confusion_matrix_counts_by_true_row():
+    cm = confusion_matrix(Y_TRUE, Y_PRED)
+    expected = np.zeros((7, 7), dtype=int)
+    expected[0, 0] = 1
+    expected[0, 1] = 1
+    expected[1, 1] = 1
+    expected[3, 3] = 2
+    expected[3, 0] = 1
+    assert cm.shape == (7, 7)
+    assert np.array_equal(cm, expected)
+
+
+def test_score_artifact_accuracy_and_recall():
+    report = score_artifact(one_hot(Y_PRED), Y_TRUE)
+    assert report["accuracy"] == 4 / 6
+    assert report["per_class_recall"]["angry"] == 0.5
+    assert report["per_class_recall"]["disgust"] == 1.0
+    assert report["per_class_recall"]["happy"] == 2 / 3
+    assert report["per_class_recall"]["sad"] == 0.0  # No support, no division by zero
+    assert report["confusion"] == confusion_matrix(Y_TRUE, Y_PRED).tolist()
+    assert "top1_agreement" not in report
+
+
+def test_score_artifact_agreement_and_drift():
+    probs = one_hot(Y_PRED)
+    reference = probs.copy()
+    reference[1, [0, 1]] = [0.25, 0.75]  # Same top-1, drift of 0.25 on two classes
+    reference[5, [0, 3]] = [0.0, 1.0]    # Top-1 flips, drift of 1.0 on two classes
+
+    report = score_artifact(probs, Y_TRUE, reference=reference)
+    assert report["top1_agreement"] == 5 / 6
+    assert report["max_prob_drift"] == 1.0
+    assert np.isclose(report["mean_prob_drift"], (0.25 * 2 + 1.0 * 2) / (6 * 7))
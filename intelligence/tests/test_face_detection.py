@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from face_detection import FaceDetector, expand_box, iou
+
+
+class FixedDetector(FaceDetector):
+    """Always 'finds' one face at (10, 10, 20, 20) in whatever image it is handed."""
+    def _detect(self, img, min_size):
+        self.seen_shape = img.shape
+        self.seen_min_size = min_size
+        return [(10, 10, 20, 20)]
+
+
+def test_downscaled_roi_boxes_map_back_to_full_res():
+    frame = np.zeros((480, 640), dtype=np.uint8)
+    detector = FixedDetector(detect_scale=0.5, min_size=(30, 30))
+
+    boxes = detector.detect(frame, roi=(100, 50, 200, 200))
+
+    assert detector.seen_shape == (100, 100)
+    assert detector.seen_min_size == (15, 15)
+    assert boxes == [(120, 70, 40, 40)]
+
+
+def test_roi_outside_frame_detects_nothing():
+    detector = FixedDetector()
+    assert detector.detect(np.zeros((100, 100), dtype=np.uint8), roi=(200, 200, 50, 50)) == []
+
+
+def test_expand_box_clips_to_frame():
+    assert expand_box((0, 0, 20, 20), 0.5, (100, 100)) == (0, 0, 30, 30)
+    assert iou((0, 0, 10, 10), (5, 0, 10, 10)) == 50 / 150
+
+
+def test_detect_scale_must_be_a_downscale():
+    for scale in (0, -0.5, 1.5):
+        with pytest.raises(ValueError):
+            FixedDetector(detect_scale=scale)
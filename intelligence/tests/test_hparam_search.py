@@ -0,0 +1,53 @@
+import pytest
+
+from hparam_search import Trial, halve, rung_schedule
+
+
+def make_trials(accuracies, tmp_path):
+    trials = []
+    for i, acc in enumerate(accuracies):
+        trial = Trial(i, {}, str(tmp_path))
+        trial.best_val_acc = acc
+        trials.append(trial)
+    return trials
+
+
+def ids(trials):
+    return [t.trial_id for t in trials]
+
+
+def test_rung_schedule_multiplies_then_caps():
+    assert rung_schedule(1, 27, 3) == [1, 3, 9, 27]
+    assert rung_schedule(2, 20, 3) == [2, 6, 18, 20]
+    assert rung_schedule(5, 5, 2) == [5]
+
+
+def test_rung_schedule_rejects_non_terminating_settings():
+    for min_epochs, max_epochs, eta in ((1, 27, 1), (0, 27, 3), (10, 5, 3)):
+        with pytest.raises(ValueError):
+            rung_schedule(min_epochs, max_epochs, eta)
+
+
+def test_halve_keeps_top_third(tmp_path):
+    survivors = make_trials([0.50, 0.61, 0.42, 0.70, 0.55, 0.48, 0.66, 0.39, 0.58], tmp_path)
+    promoted, stopped, skipped = halve(survivors, survivors, eta=3, is_last=False)
+    assert ids(promoted) == [3, 6, 1]
+    assert ids(stopped) == [8, 4, 0, 5, 2, 7]
+    assert skipped == []
+
+
+def test_halve_last_rung_promotes_nobody(tmp_path):
+    survivors = make_trials([0.5, 0.6, 0.7], tmp_path)
+    promoted, stopped, _ = halve(survivors, survivors, eta=3, is_last=True)
+    assert promoted == []
+    assert ids(stopped) == [2, 1, 0]
+
+
+def test_halve_budget_cut_rung(tmp_path):
+    # Budget ran out after 4 of 9 trials: rank those 4, keep at least one, carry the rest as finished
+    survivors = make_trials([0.50, 0.61, 0.42, 0.70, 0.55, 0.48, 0.66, 0.39, 0.58], tmp_path)
+    promoted, stopped, skipped = halve(survivors, survivors[:4], eta=3, is_last=False)
+    assert ids(promoted) == [3]
+    assert ids(stopped) == [1, 0, 2]
+    assert ids(skipped) == [4, 5, 6, 7, 8]
+    assert sorted(ids(promoted + stopped + skipped)) == list(range(9))
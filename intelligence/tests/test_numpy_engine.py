@@ -0,0 +1,60 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+from numpy_engine import NumpyEngine, conv2d, max_pool2d
+
+# PATHS
+WEB_MODEL_JSON = os.path.join("platforms", "web", "public", "models", "model.json")
+
+
+def naive_conv2d_same(x, kernel, bias):
+    """Direct 3x3 'same' convolution, the slow but obvious way."""
+    n, h, w, _ = x.shape
+    kh, kw, _, cout = kernel.shape
+    xp = np.pad(x, ((0, 0), (kh // 2, kh // 2), (kw // 2, kw // 2), (0, 0)))
+    out = np.zeros((n, h, w, cout), dtype=np.float64)
+    for i in range(h):
+        for j in range(w):
+            patch = xp[:, i:i + kh, j:j + kw, :]
+            out[:, i, j, :] = np.tensordot(patch, kernel, axes=([1, 2, 3], [0, 1, 2]))
+    return out + bias
+
+
+def test_im2col_matches_direct_convolution():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((2, 9, 7, 3)).astype(np.float32)
+    kernel = rng.standard_normal((3, 3, 3, 5)).astype(np.float32)
+    bias = rng.standard_normal(5).astype(np.float32)
+
+    fast = conv2d(x, kernel, bias, padding="same")
+    assert fast.shape == (2, 9, 7, 5)
+    assert np.abs(fast - naive_conv2d_same(x, kernel, bias)).max() < 1e-4
+
+
+def test_max_pool_halves_and_takes_max():
+    x = np.arange(2 * 4 * 4 * 1, dtype=np.float32).reshape(2, 4, 4, 1)
+    pooled = max_pool2d(x)
+    assert pooled.shape == (2, 2, 2, 1)
+    assert pooled[0, 0, 0, 0] == x[0, 1, 1, 0]
+
+
+def test_engine_runs_exported_topology(tmp_path):
+    """The real web topology must parse and produce valid probabilities (random weights)."""
+    with open(WEB_MODEL_JSON, "r") as f:
+        spec = json.load(f)
+
+    rng = np.random.default_rng(1)
+    with open(tmp_path / spec["weightsManifest"][0]["paths"][0], "wb") as f:
+        for w in spec["weightsManifest"][0]["weights"]:
+            values = rng.standard_normal(w["shape"]).astype(np.float32) * 0.05
+            if w["name"].endswith("moving_variance"):
+                values = np.abs(values) + 1.0
+            f.write(values.tobytes())
+    shutil.copy(WEB_MODEL_JSON, tmp_path / "model.json")
+
+    probs = NumpyEngine(str(tmp_path)).predict(rng.random((5, 48, 48, 1), dtype=np.float32))
+    assert probs.shape == (5, 7)
+    assert np.allclose(probs.sum(axis=1), 1.0, atol=1e-5)
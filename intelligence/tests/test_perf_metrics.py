@@ -0,0 +1,72 @@
+import csv
+import json
+
+import numpy as np
+
+from perf_metrics import P2Quantile, PerfMonitor, RingBuffer, update_personal_best
+
+
+def test_ring_buffer_wraps_in_order():
+    ring = RingBuffer(4)
+    for i in range(7):
+        ring.push(i)
+    assert len(ring) == 4
+    assert ring.values().tolist() == [3, 4, 5, 6]
+    assert ring.mean() == 4.5
+    assert ring.last() == 6
+
+
+def test_streaming_quantile_tracks_exact_percentile():
+    samples = np.random.default_rng(0).lognormal(2.0, 0.5, 10000)
+    for p in (0.5, 0.95):
+        est = P2Quantile(p)
+        for x in samples:
+            est.add(float(x))
+        exact = np.percentile(samples, p * 100)
+        assert abs(est.value() - exact) / exact < 0.02
+
+
+def test_fps_is_zero_until_second_frame():
+    perf = PerfMonitor()
+    perf.tick()
+    assert perf.fps == 0.0
+    perf.tick()
+    assert perf.fps > 0.0
+
+
+def test_disabled_monitor_records_nothing():
+    perf = PerfMonitor(enabled=False)
+    with perf.stage("detection"):
+        pass
+    perf.count("faces")
+    perf.tick()
+    assert perf.stages == {} and perf.counters == {}
+
+
+def test_disabled_monitor_keeps_fps_readout():
+    perf = PerfMonitor(enabled=False)
+    perf.tick()
+    assert perf.fps == 0.0
+    perf.tick()
+    assert perf.fps > 0.0
+    assert perf.frame_ms.count == 0
+
+
+def test_report_exports_and_personal_best(tmp_path):
+    perf = PerfMonitor("unit")
+    for ms in (5.0, 6.0, 7.0):
+        perf.record("inference", ms)
+        perf.tick()
+
+    report = json.loads(open(perf.export_json(str(tmp_path / "r.json"))).read())
+    assert report["stages"]["inference"]["count"] == 3
+    assert "cpu_count" in report["hardware"]
+
+    with open(perf.export_csv(str(tmp_path / "r.csv")), newline="") as f:
+        stages = [row["stage"] for row in csv.DictReader(f)]
+    assert stages == ["frame", "inference"]
+
+    best_path = str(tmp_path / "best.json")
+    assert update_personal_best(report, best_path) == {}
+    report["stages"]["inference"]["p50_ms"] *= 2
+    assert "inference" in update_personal_best(report, best_path)
@@ -0,0 +1,87 @@
+import argparse
+import json
+
+import pytest
+
+import training_monitor
+from train import step_window
+from training_monitor import ThroughputMonitor
+
+
+def test_step_window_accepts_ordered_pairs():
+    assert step_window("2,4") == (2, 4)
+    assert step_window("0,0") == (0, 0)
+
+
+def test_step_window_rejects_malformed_or_reversed():
+    for value in ("5", "1,2,3", "a,b", "", "3,1", "-1,2"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            step_window(value)
+
+
+class FakeClock:
+    """Stands in for the `time` module so batch boundaries land on exact timestamps."""
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+class FakeStamp:
+    """Stands in for the in-graph ready-at variable."""
+    value = 0.0
+
+    def numpy(self):
+        return self.value
+
+
+def run_batch(monitor, clock, stamp, ready_after, duration):
+    monitor.on_train_batch_begin(0)
+    stamp.value = clock.now + ready_after
+    clock.now += duration
+    monitor.on_train_batch_end(0)
+
+
+def test_wait_compute_split_and_validation_excluded(tmp_path, monkeypatch):
+    monitor = ThroughputMonitor(batch_size=32, log_dir=str(tmp_path))
+    clock, stamp = FakeClock(), FakeStamp()
+    monkeypatch.setattr(training_monitor, "time", clock)
+    monitor._ready_at = stamp
+    monitor._instrumented = True
+
+    monitor.on_train_begin()
+    monitor.on_epoch_begin(0)
+    run_batch(monitor, clock, stamp, ready_after=0.02, duration=0.1)    # 20 ms wait, 80 ms compute
+    run_batch(monitor, clock, stamp, ready_after=-0.005, duration=0.1)  # Stamp before begin: clamped to 0
+    run_batch(monitor, clock, stamp, ready_after=0.5, duration=0.1)     # Stamp after end: clamped to total
+    monitor.on_test_begin()
+    clock.now += 2.0  # Validation
+    monitor.on_epoch_end(0, {"loss": 1.0})
+
+    assert monitor._wait == pytest.approx([0.02, 0.0, 0.1])
+    assert monitor._compute == pytest.approx([0.08, 0.1, 0.0])
+
+    record = monitor.epochs[0]
+    assert record["steps"] == 3
+    assert record["train_sec"] == 0.3
+    assert record["val_sec"] == 2.0
+    assert record["epoch_sec"] == 2.3
+    assert record["samples_per_sec"] == pytest.approx(3 * 32 / 0.3, abs=0.1)
+    assert record["input_wait_ms_mean"] == pytest.approx(40.0)
+    assert record["compute_ms_mean"] == pytest.approx(60.0)
+
+    # No validation: the training window closes at the last step, not at epoch end
+    monitor.on_epoch_begin(1)
+    run_batch(monitor, clock, stamp, ready_after=0.0, duration=0.1)
+    clock.now += 0.5
+    monitor.on_epoch_end(1)
+    assert monitor.epochs[1]["train_sec"] == 0.1
+    assert monitor.epochs[1]["val_sec"] == 0.5
+
+    monitor.on_train_end()
+    saved = json.loads((tmp_path / f"epochs_{monitor.run_id}.json").read_text())
+    assert [e["epoch"] for e in saved["epochs"]] == [0, 1]